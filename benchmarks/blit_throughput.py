@@ -0,0 +1,60 @@
+"""Compare blit throughput of raw vs. display format converted images.
+
+    python benchmarks/blit_throughput.py [bullets] [frames]
+
+Blits `bullets` bullets per frame for `frames` frames with `screen.blits`,
+once with the images as generated, and once after
+`patternengine_demo.assets.normalize`.
+
+Set `SDL_VIDEODRIVER=dummy` to run it without a window.
+"""
+import sys
+
+from random import randrange, seed
+from time import perf_counter
+
+import pygame
+
+from patternengine_demo.config import SCREEN
+
+
+def bench(screen, images, bullets, frames):
+    seed(42)
+    blit_list = [(images[i % len(images)], (randrange(SCREEN.width), randrange(SCREEN.height)))
+                 for i in range(bullets)]
+
+    t0 = perf_counter()
+    for _ in range(frames):
+        screen.fill('black')
+        screen.blits(blit_list, doreturn=False)
+    pygame.display.flip()
+    return perf_counter() - t0
+
+
+def main():
+    bullets = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN.size)
+
+    # Import after set_mode, so the fonts and images are created the same way
+    # as in the running app.
+    from patternengine_demo.assets import normalize
+    from patternengine_demo.demo import BULLET_IMAGES
+
+    font = pygame.font.Font(None, 48)
+    text = [font.render(s, True, 'white') for s in ('3', '2', '1', 'Go!')]
+
+    for label, images in (('bullets', list(BULLET_IMAGES.values())), ('text', text)):
+        raw = bench(screen, images, bullets, frames)
+        converted = bench(screen, [normalize(image) for image in images], bullets, frames)
+        print(f'{label:8} raw: {bullets * frames / raw:12.0f} blits/s'
+              f'   converted: {bullets * frames / converted:12.0f} blits/s'
+              f'   speedup: {raw / converted:.2f}x')
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
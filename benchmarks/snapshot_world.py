@@ -0,0 +1,78 @@
+"""Time snapshot and restore of a world full of bullets.
+
+    python benchmarks/snapshot_world.py [bullets] [rounds]
+
+Spawns `bullets` bullets, cycling through all bullet images and through plain,
+fading and turning bullets, and reports the best of `rounds` runs of
+`Demo.snapshot` and `Demo.restore`.  Afterwards, the restored world is run
+for a frame and some bullets are removed, to make sure restoring left the
+tinyecs registry usable.
+
+Set `SDL_VIDEODRIVER=dummy` to run it without a window.
+"""
+import sys
+
+from random import random, seed
+from time import perf_counter
+from types import SimpleNamespace
+
+import glm
+import pygame
+import tinyecs as ecs
+
+from pygame import Vector2
+
+from patternengine_demo.config import FPS, SCREEN, TITLE, States
+from patternengine_demo.framework import App
+
+KINDS = (dict(speed=100),
+         dict(speed=100, fade=1),
+         dict(speed=100, lifetime=8, angular_momentum=45, fade=3))
+
+
+def best(fn, rounds):
+    times = []
+    for _ in range(rounds):
+        t0 = perf_counter()
+        fn()
+        times.append(perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    bullets = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    app = App(TITLE, SCREEN, FPS)
+
+    # Import after the App, the demo creates its images on import.
+    from patternengine_demo.demo import BULLET_FACTORIES, Demo, archetype_rows
+
+    demo = Demo(app, SimpleNamespace(font=pygame.font.Font(None), watch=False, renderer='blit'))
+    app.start(States.DEMO, {States.DEMO: demo})
+
+    seed(42)
+    factories = list(BULLET_FACTORIES.values())
+    for i in range(bullets):
+        factories[i % len(factories)](Vector2(random() * SCREEN.width, random() * SCREEN.height),
+                                      glm.vec2(1, 0), **KINDS[i % len(KINDS)])
+    entities = len(archetype_rows())  # the empty archetype holds all entities
+
+    data = demo.snapshot()
+    t_snapshot = best(demo.snapshot, rounds)
+    t_restore = best(lambda: demo.restore(data), rounds)
+
+    assert len(archetype_rows()) == entities
+    app.frame(1 / FPS)
+    for eid, _ in archetype_rows('world')[::10]:
+        ecs.remove_entity(eid)
+    assert ecs.healthcheck()
+    print(f'{entities} entities, {len(data)} bytes'
+          f'   snapshot: {t_snapshot * 1000:8.2f} ms'
+          f'   restore: {t_restore * 1000:8.2f} ms')
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""Ramp up the "Is python too slow?" stress test until frames get too slow.
+
+    python benchmarks/stress_scaling.py [--workers N] [--threshold MS] [--output FILE]
+
+Every level spawns more emitters, with bigger rings and denser heartbeats
+(see `stress_patterns`), runs the demo headless with a fixed `dt` until the
+bullets reach a steady state, and then measures the wall time per frame.  The
+ramp stops after the first level whose median frame time is above the
+threshold, by default one frame at `config.FPS`.
+
+With `--workers`, that many independent instances run the ramp in parallel,
+one process each, to see how throughput holds up per core.
+
+The scaling curve is printed and written as JSON, together with the git SHA
+of the tree, so runs can be compared across commits.
+
+The adaptive draw budget of the demo is disabled, so all levels are drawn in
+full detail.  Use `--budget` to keep it.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from statistics import median, quantiles
+from time import perf_counter
+from types import SimpleNamespace
+
+from patternengine_demo.config import FPS, SCREEN, TITLE, States
+
+BEATS = 16  # heartbeat pattern length
+
+
+def stress_patterns(level, images):
+    """The pattern definitions for ramp `level`, see `patterns.py`.
+
+    Level 0 is roughly the first wave of the demo's stress test: 2 emitters
+    with 8 bullet rings and 2 beats per 2 seconds.  Every level adds 2
+    emitters, 4 bullets per ring and one beat.  The emitters are spread over
+    the top of the screen and cycle through `images`.
+    """
+    emitters = 2 * (level + 1)
+    bullets = 8 + 4 * level
+    beats = min(2 + level, BEATS)
+    heartbeat = ''.join('#' if i * beats // BEATS != (i + 1) * beats // BEATS else '.'
+                        for i in range(BEATS))
+
+    return {
+        f'stress-{level}-{i}': dict(
+            position=('topleft', (i + 1) * SCREEN.width // (emitters + 1), 100),
+            bullets=bullets, ring=(25, bullets), heartbeat=(2, heartbeat),
+            bullet=dict(image=images[i % len(images)], speed=100),
+            lifetime=3600)
+        for i in range(emitters)
+    }
+
+
+def run_level(app, demo, level, warmup, measure):
+    from patternengine_demo.demo import BULLET_IMAGES, archetype_rows, build_pattern, crond, pattern_factory
+
+    # A fresh demo, but without the timeline.
+    demo.reset()
+    crond.heap.clear()
+    demo.post_countdown = True
+    demo.countdown.kill()
+
+    specs = stress_patterns(level, [name for name in BULLET_IMAGES if name != 'beat'])
+    for name, spec in specs.items():
+        pattern_factory(**build_pattern(spec, app.rect, demo.target), pattern=name)
+
+    dt = 1 / FPS
+    for _ in range(int(warmup * FPS)):
+        app.frame(dt)
+
+    times = []
+    bullets = 0
+    for _ in range(int(measure * FPS)):
+        t0 = perf_counter()
+        app.frame(dt)
+        times.append(perf_counter() - t0)
+        bullets += len(archetype_rows('world'))
+
+    spec = next(iter(specs.values()))
+    bullets /= len(times)
+    return dict(
+        level=level,
+        emitters=len(specs),
+        ring=spec['bullets'],
+        beats=spec['heartbeat'][1].count('#'),
+        spawned_per_s=len(specs) * spec['bullets'] * spec['heartbeat'][1].count('#') / spec['heartbeat'][0],
+        bullets=round(bullets),
+        frame_ms_p50=median(times) * 1000,
+        frame_ms_p95=quantiles(times, n=20)[-1] * 1000,
+        bullets_per_s=bullets * len(times) / sum(times),
+    )
+
+
+def ramp(threshold, max_level, warmup, measure, budget, renderer):
+    """Run the levels in this process, return the curve."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    import pygame
+
+    from patternengine_demo.framework import App
+
+    app = App(TITLE, SCREEN, FPS)
+
+    # The demo converts its images on creation, this needs the App.
+    from patternengine_demo.demo import Demo, sprite_group
+
+    demo = Demo(app, SimpleNamespace(font=pygame.font.Font(None), watch=False, renderer=renderer))
+    app.start(States.DEMO, {States.DEMO: demo})
+    if not budget:
+        sprite_group.budget = None
+        sprite_group.lod = 0
+
+    curve = []
+    for level in range(max_level + 1):
+        curve.append(run_level(app, demo, level, warmup, measure))
+        if curve[-1]['frame_ms_p50'] > threshold:
+            break
+
+    pygame.quit()
+    return curve
+
+
+def git_sha():
+    """The commit of this tree, with `-dirty` if there are local changes."""
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        sha = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=cwd, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD'], cwd=cwd).returncode
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{sha}-dirty' if dirty else sha
+
+
+def main():
+    cmdline = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    cmdline.add_argument('--workers', type=int, default=1, help='Parallel instances, one process each')
+    cmdline.add_argument('--threshold', type=float, default=1000 / FPS, help='Frame time limit in ms')
+    cmdline.add_argument('--max-level', type=int, default=30, help='Stop here, even if below the threshold')
+    cmdline.add_argument('--warmup', type=float, default=8, help='Game seconds to reach a steady state')
+    cmdline.add_argument('--measure', type=float, default=2, help='Game seconds to measure')
+    cmdline.add_argument('--budget', action='store_true', help='Keep the adaptive draw budget')
+    cmdline.add_argument('--renderer', choices=('blit', 'gl'), default='blit', help='How to draw the bullets')
+    cmdline.add_argument('--output', help='JSON file for the results, default stress-<sha>.json')
+    opts = cmdline.parse_args()
+
+    args = (opts.threshold, opts.max_level, opts.warmup, opts.measure, opts.budget, opts.renderer)
+    if opts.workers > 1:
+        # pygame doesn't survive a fork
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(opts.workers, mp_context=context) as pool:
+            curves = list(pool.map(ramp, *zip(*[args] * opts.workers)))
+    else:
+        curves = [ramp(*args)]
+
+    print(f'{"level":>5} {"emitters":>8} {"ring":>4} {"beats":>5} {"spawn/s":>8} {"bullets":>8}'
+          f' {"p50 ms":>8} {"p95 ms":>8} {"bullets/s":>10} {"total/s":>10}')
+    for level in range(min(map(len, curves))):
+        rows = [curve[level] for curve in curves]
+        row = rows[0]
+        print(f'{level:5} {row["emitters"]:8} {row["ring"]:4} {row["beats"]:5} {row["spawned_per_s"]:8.0f}'
+              f' {row["bullets"]:8} {max(r["frame_ms_p50"] for r in rows):8.2f}'
+              f' {max(r["frame_ms_p95"] for r in rows):8.2f}'
+              f' {min(r["bullets_per_s"] for r in rows):10.0f} {sum(r["bullets_per_s"] for r in rows):10.0f}')
+
+    sha = git_sha()
+    result = dict(
+        sha=sha,
+        date=datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        python=sys.version.split()[0],
+        platform=platform.platform(),
+        cpus=os.cpu_count(),
+        workers=opts.workers,
+        threshold_ms=opts.threshold,
+        warmup=opts.warmup,
+        measure=opts.measure,
+        budget=opts.budget,
+        renderer=opts.renderer,
+        curves=curves,
+    )
+    output = opts.output or f'stress-{sha[:12]}.json'
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f'Written to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Aim many bullet sources at several targets in one pass.
+
+`pecs.aim_ring_system` aims one emitter at a time at a single, fixed target
+entity.  `aim_angles` takes all emitters and all targets at once, picks an
+assigned or the nearest target per emitter, and optionally leads the target,
+aiming where it will be when a bullet arrives.
+"""
+from math import atan2, degrees, sqrt
+
+__all__ = ['aim_angles', 'intercept']
+
+
+def intercept(dx, dy, vx, vy, speed):
+    """Time until a bullet with `speed` can hit a moving target.
+
+    The target is at `(dx, dy)` relative to the shooter and moves with
+    `(vx, vy)`.  Returns `None` if the bullet can't catch up.
+    """
+    a = vx * vx + vy * vy - speed * speed
+    b = 2 * (dx * vx + dy * vy)
+    c = dx * dx + dy * dy
+
+    if abs(a) < 1e-9:
+        return -c / b if b < 0 else None
+
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return None
+
+    root = sqrt(disc)
+    return min((t for t in ((-b - root) / (2 * a), (-b + root) / (2 * a)) if t > 0), default=None)
+
+
+def aim_angles(sources, targets, assigned=None, speeds=None):
+    """Aim angles for all `sources`.
+
+    Parameters
+    ----------
+    sources : Sequence[tuple[float, float]]
+        The emitter positions.
+
+    targets : Sequence[tuple[float, float, float, float]]
+        Position and momentum `(x, y, vx, vy)` of all targets.
+
+    assigned : Sequence[int | None] = None
+        Per source, the index of its target in `targets`, or `None` to aim
+        at the nearest one.  Without `assigned`, all sources aim at their
+        nearest target.
+
+    speeds : Sequence[float | None] = None
+        Per source, the bullet speed to lead the target with, or `None` to
+        aim straight at it.
+
+    Returns
+    -------
+    list[float | None]
+        The angles in degrees, `None` if there is no target.
+
+    """
+    if not targets:
+        return [None] * len(sources)
+
+    if assigned is None:
+        assigned = [None] * len(sources)
+    if speeds is None:
+        speeds = [None] * len(sources)
+
+    angles = []
+    for (x, y), target, speed in zip(sources, assigned, speeds):
+        if target is None:
+            tx, ty, vx, vy = min(targets, key=lambda t: (t[0] - x) ** 2 + (t[1] - y) ** 2)
+        else:
+            tx, ty, vx, vy = targets[target]
+
+        dx = tx - x
+        dy = ty - y
+        if speed and (t := intercept(dx, dy, vx, vy, abs(speed))) is not None:
+            dx += vx * t
+            dy += vy * t
+
+        angles.append(degrees(atan2(dy, dx)))
+
+    return angles
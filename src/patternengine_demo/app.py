@@ -1,20 +1,41 @@
+import argparse
+import asyncio
 import pygame
 
 from enum import Enum
 from types import SimpleNamespace
 
 from patternengine_demo.framework import App
+from patternengine_demo.replay import Player, Recorder
 
-from patternengine_demo.config import TITLE, SCREEN, FPS, States
+from patternengine_demo.config import TITLE, SCREEN, FPS, METRICS_RATE, States
 from patternengine_demo.title import Title
 from patternengine_demo.demo import Demo
 
 
 def main():
-    app = App(TITLE, SCREEN, FPS)
+    cmdline = argparse.ArgumentParser(description='Pattern Engine Demo')
+    cmdline.add_argument('--asyncio', action='store_true', help='Run the game loop as an asyncio coroutine')
+    cmdline.add_argument('--watch', action='store_true', help='Hot reload patterns.py when it changes')
+    cmdline.add_argument('--record', metavar='FILE', help='Record the session to FILE')
+    cmdline.add_argument('--play', metavar='FILE', help='Play back a recording, LEFT/RIGHT seek')
+    cmdline.add_argument('--seek', metavar='MS', type=int, help='Start playback at MS milliseconds')
+    cmdline.add_argument('--renderer', choices=('blit', 'gl'), default='blit',
+                         help='Draw bullets with blits or OpenGL (needs moderngl)')
+    opts = cmdline.parse_args()
+
+    app = App(TITLE, SCREEN, FPS, metrics_rate=METRICS_RATE)
+
+    # Before the states are created, they depend on the random state.
+    if opts.play:
+        app.replay = Player(opts.play, seek=opts.seek)
+    elif opts.record:
+        app.replay = Recorder(opts.record)
 
     persist = SimpleNamespace(
         font=pygame.font.Font(None),
+        watch=opts.watch,
+        renderer=opts.renderer,
     )
 
     states = {
@@ -22,7 +43,10 @@ def main():
         States.DEMO: Demo(app, persist),
     }
 
-    app.run(States.TITLE, states)
+    if opts.asyncio:
+        asyncio.run(app.run_async(States.TITLE, states))
+    else:
+        app.run(States.TITLE, states)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,82 @@
+import pygame
+
+__all__ = ['lod_image', 'normalize', 'normalize_all']
+
+
+def normalize(image):
+    """Convert `image` to the pixel format of the display.
+
+    Surfaces in a different format than the display are converted on every
+    blit.  Depending on the image, the result is either
+
+        * a per-pixel alpha surface (`convert_alpha`), if the image has
+          `SRCALPHA` set, e.g. antialiased text, or
+        * an opaque surface (`convert`) with an RLE accelerated colorkey, if the
+          image uses a colorkey, e.g. the bullet images, or
+        * a plain opaque surface.
+
+    Without a display mode, there is nothing to convert to, so the image is
+    returned unchanged.
+
+    Parameters
+    ----------
+    image : pygame.Surface
+        The image to convert.
+
+    Returns
+    -------
+    pygame.Surface
+        The converted image.  This is always a new surface, except when there
+        is no display.
+
+    """
+    if pygame.display.get_surface() is None:
+        return image
+
+    if image.get_flags() & pygame.SRCALPHA:
+        return image.convert_alpha()
+
+    colorkey = image.get_colorkey()
+    image = image.convert()
+    if colorkey is not None:
+        image.set_colorkey(colorkey, pygame.RLEACCEL)
+
+    return image
+
+
+def normalize_all(images):
+    """`normalize` all values of the dict `images` in place."""
+    for key, image in images.items():
+        images[key] = normalize(image)
+
+
+def lod_image(image, scale=0.5):
+    """Create a cheaper level-of-detail version of `image`.
+
+    The content is scaled down by `scale`, but centered on a canvas of the
+    original size, so a sprite can switch between both without touching its
+    rect.  Fewer opaque pixels make colorkey and alpha blits cheaper.
+
+    Parameters
+    ----------
+    image : pygame.Surface
+        The full detail image.
+
+    scale : float = 0.5
+        Scale of the content.
+
+    Returns
+    -------
+    pygame.Surface
+        The normalized LOD image.
+
+    """
+    colorkey = image.get_colorkey()
+
+    canvas = image.copy()
+    canvas.fill(colorkey if colorkey is not None else (0, 0, 0, 0))
+
+    small = pygame.transform.scale_by(image, scale)
+    canvas.blit(small, small.get_rect(center=canvas.get_rect().center))
+
+    return normalize(canvas)
@@ -0,0 +1,109 @@
+import pygame
+
+__all__ = ['Background']
+
+
+class Background:
+    """A quantized background gradient.
+
+    Instead of lerping a color every frame, the gradient between `c0` and `c1`
+    is quantized into `steps` entries, and the color is only recomputed when
+    the selection changes.  Without a backdrop image, an entry is a plain
+    color, and restoring the screen is a `fill`, the cheapest full screen
+    operation there is.
+
+    If an `image` is given, it is used as the backdrop instead of `c0`, and
+    the gradient tints it towards `c1`.  Then each entry is a full screen
+    surface, created on first use, and converted to the display format, so
+    restoring it is a plain opaque blit.
+
+    Parameters
+    ----------
+    size : tuple[int, int]
+        Size of the screen.
+
+    c0, c1 : pygame.Color | str
+        The endpoints of the gradient.  If `c1` is `None`, there is only a
+        single entry.
+
+    steps : int = 8
+        Number of entries in the palette.
+
+    image : pygame.Surface = None
+        Optional static backdrop.  It's scaled to `size`.
+
+    Attributes
+    ----------
+    color : pygame.Color
+        The currently selected color, without backdrop.
+
+    image : pygame.Surface
+        The currently selected background surface, `None` without backdrop.
+        This can directly be used with `pygame.sprite.Group.clear`.
+
+    """
+    def __init__(self, size, c0='black', c1=None, steps=8, image=None):
+        self.size = size
+        self.c0 = pygame.Color(c0)
+        self.c1 = pygame.Color(c1) if c1 is not None else self.c0
+        self.steps = steps if c1 is not None else 1
+        if image is not None and image.get_size() != tuple(size):
+            image = pygame.transform.scale(image, size)
+        self.backdrop = image
+
+        self._palette = {}
+        self._index = None
+        self.color = None
+        self.image = None
+
+        self.select(0)
+
+    def _create(self, index):
+        t = index / (self.steps - 1) if self.steps > 1 else 0
+
+        image = self.backdrop
+        if t:
+            image = image.copy()
+            tint = pygame.Surface(self.size)
+            tint.fill(self.c1)
+            tint.set_alpha(int(t * 255))
+            image.blit(tint, (0, 0))
+
+        if pygame.display.get_surface():
+            image = image.convert()
+
+        return image
+
+    def select(self, t):
+        """Select the palette entry closest to `t` (0 - 1) on the gradient.
+
+        Returns `True` if the selection changed.
+        """
+        index = round(min(max(t, 0), 1) * (self.steps - 1))
+        if index == self._index:
+            return False
+
+        self._index = index
+        if self.backdrop is None:
+            self.color = self.c0.lerp(self.c1, index / (self.steps - 1) if self.steps > 1 else 0)
+            return True
+
+        if index not in self._palette:
+            self._palette[index] = self._create(index)
+        self.image = self._palette[index]
+        return True
+
+    def draw(self, screen):
+        """Restore the full screen."""
+        if self.image is None:
+            screen.fill(self.color)
+        else:
+            screen.blit(self.image, (0, 0))
+
+    def restore(self, screen, rects):
+        """Only restore the background below `rects`."""
+        if self.image is None:
+            for rect in rects:
+                screen.fill(self.color, rect)
+        else:
+            screen.blits([(self.image, rect, rect) for rect in rects], doreturn=False)
@@ -3,6 +3,8 @@ import pygame
 from enum import Enum
 
 FPS = 60
+METRICS_RATE = 2
+DRAW_BUDGET = 0.5 / FPS  # seconds per frame for blitting bullets
 SCREEN = pygame.Rect(0, 0, 1024, 768)
 TITLE = 'Pattern Engine Demo'
 
@@ -3,28 +3,242 @@ import pygame
 import tinyecs as ecs
 import tinyecs.compsys as ecsc
 
-import patternengine as pe
 import patternengine.compsys as pecs
 
 from functools import lru_cache, partial
 from random import random
+from time import perf_counter
 
-from pgcooldown import Cooldown, CronD, LerpThing
 from pygame import Vector2
+from patternengine_demo import patterns
+from patternengine_demo.aiming import aim_angles
+from patternengine_demo.assets import lod_image, normalize, normalize_all
+from patternengine_demo.background import Background
+from patternengine_demo.config import DRAW_BUDGET
+from patternengine_demo.easing import lerp_batch
 from patternengine_demo.framework import GameState
+from patternengine_demo.glrender import create_renderer
+from patternengine_demo.hotreload import DictWatcher
+from patternengine_demo.pause import Pause
+from patternengine_demo.snapshot import clear_world, codec, make_bullet_source
+from patternengine_demo.timers import Cooldown, CronD, Cronjob, LerpThing
 from rpeasings import *  # noqa: F401, F403
 
 
+FADE_DURATION = 0.25
+COUNTDOWN = ('3', '2', '1', 'Go!')
+TIME_SCALE = (1 / 8, 8)  # slowest and fastest gameclock scale
+
 crond = CronD()
 
 
+class _Batch:
+    """Persistent blit sequences for all static sprites sharing one image.
+
+    `blits` and `lod_blits` hold `(image, rect)` tuples, where `rect` is the
+    sprite's own rect, so these lists can directly be passed to `fblits`
+    every frame.  Removal swaps the last entry into the hole, so order is not
+    preserved.
+    """
+    __slots__ = ('image', 'lod_image', 'blits', 'lod_blits', 'sprites')
+
+    def __init__(self, image, lod_image):
+        self.image = image
+        self.lod_image = lod_image
+        self.blits = []
+        self.lod_blits = []
+        self.sprites = []
+
+    def append(self, sprite):
+        """Add `sprite`, return its index."""
+        self.blits.append((self.image, sprite.rect))
+        self.lod_blits.append((self.lod_image, sprite.rect))
+        self.sprites.append(sprite)
+        return len(self.sprites) - 1
+
+    def remove(self, index):
+        """Remove the sprite at `index`.
+
+        Returns the sprite that was moved into `index`, or `None`.
+        """
+        blit = self.blits.pop()
+        lod_blit = self.lod_blits.pop()
+        sprite = self.sprites.pop()
+        if index == len(self.sprites):
+            return None
+
+        self.blits[index] = blit
+        self.lod_blits[index] = lod_blit
+        self.sprites[index] = sprite
+        return sprite
+
+
 class FBlitGroup(pygame.sprite.Group):
+    """A sprite group that draws its sprites with batched `fblits` calls.
+
+    Sprites with a fixed image (`tinyecs.compsys.ESprite`) are kept in
+    persistent per-image blit sequences.  These hold the sprites' own rects,
+    which the `sprite_system` moves in place, so nothing is rebuilt per frame,
+    and every image is submitted with a single call.  The image of such a
+    sprite must not be replaced after it was added.
+
+    All other sprites, e.g. an `EVSprite` with a fading image, or a
+    `TextSprite`, are collected every frame.
+
+    Draw order is by image, not by insertion.
+
+    If a `budget` in seconds is given, the time spent in `draw` is measured,
+    and under overload, the group steps up its level of detail `lod`:
+
+        0: Full detail
+        1: Fade variants are no longer updated.  The group can't do this
+           itself, the systems creating these variants need to check `lod`.
+        2: Images found in `lod_images` are replaced by their smaller
+           versions.
+        3: Only every other sprite is drawn per frame, alternating.
+
+    Only drawing is affected, the simulation stays exact.  With a `renderer`,
+    the budget is ignored and `lod` stays 0, the renderer always draws in full
+    detail.
+
+    Parameters
+    ----------
+    *sprites
+        Passed on to `pygame.sprite.Group`.
+
+    budget : float = None
+        Time in seconds `draw` may take per frame.
+
+    renderer : glrender.GLRenderer = None
+        Draw with this instead of blitting, see `glrender`.
+
+    Attributes
+    ----------
+    lod : int
+        The current level of detail.
+    cost : float
+        Smoothed time spent in `draw`.
+    lod_images : dict[pygame.Surface, pygame.Surface]
+        Full detail to LOD image mapping.  See `assets.lod_image`.  Fill this
+        before adding sprites with these images.
+    """
+    LOD_MAX = 3
+    LOD_HOLD = 30  # frames to keep a new lod before reconsidering
+    STATIC = (ecsc.ESprite, )
+
+    def __init__(self, *sprites, budget=None, renderer=None):
+        self.budget = budget
+        self.renderer = renderer
+        self.lod = 0
+        self.cost = 0
+        self.lod_images = {}
+
+        self._frame = 0
+        self._hold = 0
+
+        self._batches = {}  # image -> _Batch
+        self._slots = {}  # sprite -> (_Batch, index)
+        self._dynamic = {}
+        # ESprite adds itself to its groups before it has an image, so new
+        # sprites are only sorted in on the next draw.
+        self._pending = {}
+
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._pending[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+
+        if sprite in self._slots:
+            batch, index = self._slots.pop(sprite)
+            if moved := batch.remove(index):
+                self._slots[moved] = (batch, index)
+        elif sprite in self._dynamic:
+            del self._dynamic[sprite]
+        else:
+            del self._pending[sprite]
+
+    def _sort_in(self):
+        for sprite in self._pending:
+            if not isinstance(sprite, self.STATIC):
+                self._dynamic[sprite] = None
+                continue
+
+            image = sprite.image
+            try:
+                batch = self._batches[image]
+            except KeyError:
+                batch = self._batches[image] = _Batch(image, self.lod_images.get(image, image))
+            self._slots[sprite] = (batch, batch.append(sprite))
+
+        self._pending.clear()
+
     def draw(self, screen):
-        blit_list = [(sprite.image, sprite.rect.topleft) for sprite in self.sprites()]
-        screen.blits(blit_list)
+        t0 = perf_counter()
+
+        if self._pending:
+            self._sort_in()
+
+        if self.renderer is not None:
+            self.renderer.draw(screen, self._batches.values(), self._dynamic)
+            return
+
+        self._blit(screen)
+
+        if self.budget is not None:
+            self.adapt(perf_counter() - t0)
+
+    def _blit(self, screen):
+        try:
+            blit = screen.fblits
+        except AttributeError:
+            blit = partial(screen.blits, doreturn=False)
+
+        lod = self.lod
+        if lod >= 3:
+            self._frame ^= 1
+
+        for batch in self._batches.values():
+            blits = batch.lod_blits if lod >= 2 else batch.blits
+            if lod >= 3:
+                blits = blits[self._frame::2]
+            if blits:
+                blit(blits)
+
+        if self._dynamic:
+            sprites = list(self._dynamic)
+            if lod >= 3:
+                sprites = sprites[self._frame::2]
+
+            if lod >= 2:
+                get = self.lod_images.get
+                blit_list = [(get(image, image), rect)
+                             for image, rect in ((sprite.image, sprite.rect) for sprite in sprites)]
+            else:
+                blit_list = [(sprite.image, sprite.rect) for sprite in sprites]
+            blit(blit_list)
+
+    def adapt(self, cost):
+        """Feed the measured draw `cost` into the lod controller."""
+        self.cost += (cost - self.cost) * 0.1
+
+        if self._hold:
+            self._hold -= 1
+            return
+
+        if self.cost > self.budget and self.lod < self.LOD_MAX:
+            self.lod += 1
+            self._hold = self.LOD_HOLD
+        elif self.cost < self.budget / 2 and self.lod > 0:
+            self.lod -= 1
+            self._hold = self.LOD_HOLD
 
 
-sprite_group = FBlitGroup()
+sprite_group = FBlitGroup(budget=DRAW_BUDGET)
+codec.register('sprite_group', sprite_group)
 
 
 class TextSprite(pygame.sprite.Sprite):
@@ -34,7 +248,7 @@ class TextSprite(pygame.sprite.Sprite):
         self._text = ''
 
         self.font = pygame.font.Font(None, size)
-        self.image = self.font.render(self._text, True, 'white')
+        self.image = normalize(self.font.render(self._text, True, 'white'))
         self.rect = self.image.get_rect(center=pos)
 
     @property
@@ -43,7 +257,7 @@ class TextSprite(pygame.sprite.Sprite):
     @text.setter
     def text(self, s):
         self._text = s
-        self.image = self.font.render(s, True, 'white')
+        self.image = normalize(self.font.render(s, True, 'white'))
         self.rect = self.image.get_rect(center=self.rect.center)
 
     def __repr__(self):
@@ -74,9 +288,12 @@ def bullet_image_factory(r0, r1, w, c0, c1, c2=None):
     return image
 
 
-def bullet_factory(position, momentum, speed, image, sprite_group, fade=False, **kwargs):
-    fade_duration = 0.25
+def fade_out(eid):
+    if ecs.has(eid):
+        ecs.add_component(eid, 'fade', LerpThing(255, 0, FADE_DURATION, ease=in_quad))  # noqa: F405
 
+
+def bullet_factory(position, momentum, speed, image, sprite_group, fade=False, **kwargs):
     e = ecs.create_entity()
     ecs.add_component(e, 'position', position)
     ecs.add_component(e, 'momentum', momentum * speed)
@@ -86,14 +303,10 @@ def bullet_factory(position, momentum, speed, image, sprite_group, fade=False, *
         rsai = ecsc.RSAImage(image=image, alpha=0)
         ecs.add_component(e, 'rsai', rsai)
         ecs.add_component(e, 'sprite', ecsc.EVSprite(rsai, sprite_group))
-        ecs.add_component(e, 'fade', LerpThing(0, 255, fade_duration, ease=in_quad))  # noqa: F405
+        ecs.add_component(e, 'fade', LerpThing(0, 255, FADE_DURATION, ease=in_quad))  # noqa: F405
     else:
         ecs.add_component(e, 'sprite', ecsc.ESprite(sprite_group, image=image))
 
-    def add_fadeout(eid):
-        if ecs.has(eid):
-            ecs.add_component(eid, 'fade', LerpThing(255, 0, fade_duration, ease=in_quad))  # noqa: F405
-
     for cid, comp in kwargs.items():
         if cid == 'rotation':
             comp.duration.reset()
@@ -103,7 +316,7 @@ def bullet_factory(position, momentum, speed, image, sprite_group, fade=False, *
 
             if fade & 2:
                 fadeout_start = comp.duration
-                crond.add(fadeout_start - fade_duration, partial(add_fadeout, e))
+                crond.add(fadeout_start - FADE_DURATION, partial(fade_out, e))
 
         ecs.add_component(e, cid, comp)
 
@@ -136,411 +349,291 @@ BULLET_IMAGES = {
 }
 
 BULLET_FACTORIES = {
-    'hotpink': partial(bullet_factory, sprite_group=sprite_group, image=BULLET_IMAGES['hotpink']),
-    'cyan': partial(bullet_factory, sprite_group=sprite_group, image=BULLET_IMAGES['cyan']),
-    'yellow': partial(bullet_factory, sprite_group=sprite_group, image=BULLET_IMAGES['yellow']),
-    'lightblue': partial(bullet_factory, sprite_group=sprite_group, image=BULLET_IMAGES['lightblue']),
-    'green': partial(bullet_factory, sprite_group=sprite_group, image=BULLET_IMAGES['green']),
-    'red': partial(bullet_factory, sprite_group=sprite_group, image=BULLET_IMAGES['red']),
-    'beat': partial(bullet_factory, sprite_group=sprite_group, image=BULLET_IMAGES['beat']),
+    name: partial(bullet_factory, sprite_group=sprite_group, image=image)
+    for name, image in BULLET_IMAGES.items()
 }
 
 
+def prepare_assets():
+    """Convert all bullet images to the display format.
+
+    This needs a display mode, so it can only run after the `App` is
+    initialized.  The factories are recreated to use the converted images,
+    and the LOD images for the draw budget are baked.  The images are
+    registered with the snapshot codec.
+    """
+    normalize_all(BULLET_IMAGES)
+    for name, image in BULLET_IMAGES.items():
+        BULLET_FACTORIES[name] = partial(bullet_factory, sprite_group=sprite_group, image=image)
+        sprite_group.lod_images[image] = lod_image(image)
+        codec.register(f'image:{name}', image)
+
+
+def build_pattern(spec, rect, target):
+    """Turn a pattern definition from `patterns.py` into components.
+
+    Returns a dict suitable as keyword arguments for `pattern_factory`.
+    """
+    anchor, dx, dy = spec['position']
+    x, y = getattr(rect, anchor)
+
+    bullet = dict(spec['bullet'])
+    image = bullet.pop('image')
+
+    comps = dict(
+        position=(x + dx, y + dy),
+        bullet_source=make_bullet_source(
+            bullets=spec['bullets'],
+            ring=spec['ring'],
+            heartbeat=spec['heartbeat'],
+            aim=spec.get('aim', 0)),
+        bullet_factory=partial(BULLET_FACTORIES[image], **bullet),
+        lifetime=spec['lifetime'],
+    )
+    if 'rotation' in spec:
+        vt0, vt1, duration, repeat = spec['rotation']
+        comps['rotation'] = LerpThing(vt0, vt1, duration, repeat=repeat)
+    if 'momentum' in spec:
+        comps['momentum'] = Vector2(spec['momentum'])
+    if aimed := spec.get('aimed'):
+        comps['target'] = None if aimed == 'nearest' else target
+        if spec.get('lead'):
+            comps['lead'] = True
+
+    return comps
+
+
+def spawn_pattern(name, rect, target):
+    """Create the emitter for pattern `name`.
+
+    The definition is looked up when the emitter is spawned, so scheduled
+    patterns pick up hot reloaded definitions.
+    """
+    return pattern_factory(**build_pattern(patterns.PATTERNS[name], rect, target), pattern=name)
+
+
+def swap_patterns(names, rect, target):
+    """Queue rebuilt bullet sources for all live emitters of pattern `names`.
+
+    The swap itself is done by `pattern_swap_system` at the next heartbeat.
+    """
+    names = set(names)
+    for eid, (name, ) in ecs.eids_by_cids('pattern'):
+        if name in names:
+            ecs.add_component(eid, 'pattern-swap', build_pattern(patterns.PATTERNS[name], rect, target))
+
+
+def pattern_swap_system(dt, eid, pattern_swap, bullet_source):
+    """Swap in a rebuilt pattern when the heartbeat is back at its start.
+
+    The new heartbeat starts cold at its first step, so it takes over exactly
+    where the old one would have started over, and no beat is emitted out of
+    phase.
+
+    Only the bullet source, factory and rotation are replaced.  The emitter
+    keeps its position and lifetime, and bullets already in flight are not
+    touched.
+    """
+    heartbeat = bullet_source.heartbeat
+    if heartbeat.cooldown.hot() or heartbeat.c.i != 0:
+        return
+
+    ecs.add_component(eid, 'bullet_source', pattern_swap['bullet_source'])
+    ecs.add_component(eid, 'bullet_factory', pattern_swap['bullet_factory'])
+    if 'rotation' in pattern_swap:
+        ecs.add_component(eid, 'rotation', pattern_swap['rotation'])
+    elif ecs.eid_has(eid, 'rotation'):
+        ecs.remove_component(eid, 'rotation')
+    ecs.remove_component(eid, 'pattern-swap')
+
+
+def cull_system(dt, eid, world, position, sprite, *, view, deadzone):
+    """Move bullets leaving the `view` to the offscreen tier.
+
+    Offscreen, the `sprite` component is replaced by `offscreen`, which holds
+    the sprite, but not in `sprite_group`.  So the bullet is still moved, but
+    its sprite isn't synced, drawn or counted, and fades are not rendered.
+    Bullets leaving the `deadzone` are removed, like `ecsc.deadzone_system`.
+    """
+    if view.collidepoint(position):
+        return
+
+    if deadzone.collidepoint(position):
+        ecs.remove_component(eid, 'sprite')  # kills the sprite
+        ecs.add_component(eid, 'offscreen', sprite)
+    else:
+        ecs.remove_entity(eid)
+
+
+def uncull_system(dt, eid, world, position, offscreen, *, view, deadzone):
+    """Move offscreen bullets entering the `view` back to `sprite_group`.
+
+    See `cull_system`.
+    """
+    if view.collidepoint(position):
+        ecs.remove_component(eid, 'offscreen')
+        offscreen.add(sprite_group)
+        ecs.add_component(eid, 'sprite', offscreen)
+    elif not deadzone.collidepoint(position):
+        ecs.remove_entity(eid)
+
+
+def archetype_rows(*cids):
+    """All `(eid, comps)` with the components `cids`, for batch systems."""
+    ecs.create_archetype(*cids)
+    return ecs.comps_of_archetype(*cids)
+
+
+def aim_system(rows):
+    """Aim all `bullet_source`s with a `target` component at once.
+
+    `target` is the eid of the target entity, or `None` to aim at the nearest
+    entity with a `targetable` component.  With a `lead` component, the ring
+    aims where the target will be when the bullets arrive, from the target's
+    `momentum` and the bullet speed of the `bullet_factory`.
+    """
+    if not rows:
+        return
+
+    targets = []
+    index = {}
+    for eid, (_, position) in archetype_rows('targetable', 'position'):
+        momentum = ecs.comp_of_eid(eid, 'momentum') if ecs.eid_has(eid, 'momentum') else (0, 0)
+        index[eid] = len(targets)
+        targets.append((position[0], position[1], momentum[0], momentum[1]))
+
+    # Sources with a vanished target are left alone.
+    rows = [row for row in rows if row[1][2] is None or row[1][2] in index]
+    angles = aim_angles(
+        [position for _, (_, position, _) in rows],
+        targets,
+        [None if target is None else index[target] for _, (_, _, target) in rows],
+        [ecs.comp_of_eid(eid, 'bullet_factory').keywords.get('speed') if ecs.eid_has(eid, 'lead') else None
+         for eid, _ in rows])
+
+    for (_, (bullet_source, _, _)), angle in zip(rows, angles):
+        if angle is not None:
+            bullet_source.ring.aim = angle
+
+
+def update_label(label, s):
+    label.text = s
+
+
 def schedule_demo(t, label, rect, target):
-    def update_label(s):
-        label.text = s
-
-    crond.add(t, partial(update_label, 'Simple 4 step ring'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=4,
-                             ring=pe.Ring(50, 4),
-                             heartbeat=pe.Heartbeat(1, '#.......#.......')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=100, fade=1),
-                         lifetime=7.95))
+    set_label = partial(update_label, label)
+
+    def spawn(*names):
+        for name in names:
+            crond.add(t, partial(spawn_pattern, name, rect, target))
+
+    crond.add(t, partial(set_label, 'Simple 4 step ring'))
+    spawn('simple-ring')
     t += 8
 
-    crond.add(t, partial(update_label, 'Ring stack'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=18,
-                             ring=pe.Ring(50, 18),
-                             heartbeat=pe.Heartbeat(1, '#.#.#...........')),
-                         bullet_factory=partial(BULLET_FACTORIES['cyan'], speed=100, fade=1),
-                         lifetime=7.95))
+    crond.add(t, partial(set_label, 'Ring stack'))
+    spawn('ring-stack')
     t += 8
 
-    crond.add(t, partial(update_label, 'Simple ring + Stack with 10° aim'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=18,
-                             ring=pe.Ring(50, 18),
-                             heartbeat=pe.Heartbeat(1, '#.......#.......')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=100, fade=1),
-                         lifetime=7.95))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=18,
-                             ring=pe.Ring(50, 18),
-                             heartbeat=pe.Heartbeat(1, '#.#.#...........'),
-                             aim=10),
-                         bullet_factory=partial(BULLET_FACTORIES['cyan'], speed=100, fade=1),
-                         lifetime=7.95))
+    crond.add(t, partial(set_label, 'Simple ring + Stack with 10° aim'))
+    spawn('ring-and-stack-ring', 'ring-and-stack-stack')
     t += 8
 
-    crond.add(t, partial(update_label, 'Ring with 5 steps'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=5,
-                             ring=pe.Ring(50, 5),
-                             heartbeat=pe.Heartbeat(1, '#...............')),
-                         bullet_factory=partial(BULLET_FACTORIES['yellow'], speed=100, fade=1),
-                         lifetime=3.95))
+    crond.add(t, partial(set_label, 'Ring with 5 steps'))
+    spawn('five-steps-single')
     t += 4
-    crond.add(t, partial(update_label, 'Ring with 5 steps'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=5,
-                             ring=pe.Ring(50, 5),
-                             heartbeat=pe.Heartbeat(1, '#.......#.......')),
-                         bullet_factory=partial(BULLET_FACTORIES['yellow'], speed=100, fade=1),
-                         lifetime=3.95))
+    crond.add(t, partial(set_label, 'Ring with 5 steps'))
+    spawn('five-steps-double')
     t += 4
 
-    crond.add(t, partial(update_label, 'Ring with 5 steps, rotating'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=5,
-                             ring=pe.Ring(50, 5),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['yellow'], speed=100, fade=3),
-                         rotation=LerpThing(0, 360, 8, repeat=1),
-                         lifetime=3.95))
+    crond.add(t, partial(set_label, 'Ring with 5 steps, rotating'))
+    spawn('five-steps-rotating')
     t += 4
 
-    crond.add(t, partial(update_label, 'Ring with 1 step, rotating'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=1,
-                             ring=pe.Ring(50, 1),
-                             heartbeat=pe.Heartbeat(1, '################')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=100, fade=1),
-                         rotation=LerpThing(0, 360, 8, repeat=1),
-                         lifetime=1.95))
+    crond.add(t, partial(set_label, 'Ring with 1 step, rotating'))
+    spawn('one-step-rotating')
     t += 2
 
-    crond.add(t, partial(update_label, 'Ring with 2 steps, rotating'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=2,
-                             ring=pe.Ring(10, 2),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=100, fade=1),
-                         rotation=LerpThing(0, 360, 8, repeat=1),
-                         lifetime=1.95))
+    crond.add(t, partial(set_label, 'Ring with 2 steps, rotating'))
+    spawn('two-steps-rotating')
     t += 2
 
-    crond.add(t, partial(update_label, 'Ring with 4 steps, rotating'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=4,
-                             ring=pe.Ring(10, 4),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=100, fade=1),
-                         rotation=LerpThing(0, 360, 8, repeat=1),
-                         lifetime=1.95))
+    crond.add(t, partial(set_label, 'Ring with 4 steps, rotating'))
+    spawn('four-steps-rotating')
     t += 2
 
-    crond.add(t, partial(update_label, 'Ring with 8 steps, rotating'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=8,
-                             ring=pe.Ring(10, 8),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=100, fade=1),
-                         rotation=LerpThing(0, 360, 8, repeat=1),
-                         lifetime=1.95))
+    crond.add(t, partial(set_label, 'Ring with 8 steps, rotating'))
+    spawn('eight-steps-rotating')
     t += 2
 
-    crond.add(t, partial(update_label, 'Ring with 36 steps, rotating'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=36,
-                             ring=pe.Ring(10, 36),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=100, fade=1),
-                         rotation=LerpThing(0, 360, 8, repeat=1),
-                         lifetime=3.95))
+    crond.add(t, partial(set_label, 'Ring with 36 steps, rotating'))
+    spawn('thirtysix-steps-rotating')
     t += 8
 
-    crond.add(t, partial(update_label, 'Half rings'))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.centerx, 50),
-                         bullet_source=pe.BulletSource(
-                             bullets=18,
-                             ring=pe.Ring(50, 18, aim=90, width=180),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=100, fade=1),
-                         lifetime=7.95))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.centerx, rect.height - 50),
-                         bullet_source=pe.BulletSource(
-                             bullets=18,
-                             ring=pe.Ring(50, 18, aim=-90, width=180),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['cyan'], speed=100, fade=1),
-                         lifetime=7.95))
+    crond.add(t, partial(set_label, 'Half rings'))
+    spawn('half-ring-top', 'half-ring-bottom')
     t += 4
 
-    crond.add(t, partial(update_label, 'Quarter rings'))
-    crond.add(t, partial(pattern_factory,
-                         position=(50, 50),
-                         bullet_source=pe.BulletSource(
-                             bullets=5,
-                             ring=pe.Ring(0, 5, aim=45, width=90),
-                             heartbeat=pe.Heartbeat(2, '#.#.#.#.#.#.#.#.')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=100, fade=1),
-                         lifetime=7.95))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.width - 50, rect.height - 50),
-                         bullet_source=pe.BulletSource(
-                             bullets=5,
-                             ring=pe.Ring(0, 5, aim=-135, width=90),
-                             heartbeat=pe.Heartbeat(2, '#.#.#.#.#.#.#.#.')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=100, fade=1),
-                         lifetime=7.95))
+    crond.add(t, partial(set_label, 'Quarter rings'))
+    spawn('quarter-ring-topleft', 'quarter-ring-bottomright')
     t += 4
 
-    crond.add(t, partial(update_label, 'Actually any angle rings'))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.width / 4 * 3, 50),
-                         bullet_source=pe.BulletSource(
-                             bullets=4,
-                             ring=pe.Ring(50, 4, aim=90, width=30),
-                             heartbeat=pe.Heartbeat(2, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['yellow'], speed=100, fade=1),
-                         lifetime=3.95))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.width / 4, rect.height - 50),
-                         bullet_source=pe.BulletSource(
-                             bullets=4,
-                             ring=pe.Ring(50, 4, aim=-90, width=30),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['yellow'], speed=100, fade=1),
-                         lifetime=3.95))
+    crond.add(t, partial(set_label, 'Actually any angle rings'))
+    spawn('any-angle-top', 'any-angle-bottom')
     t += 8
 
-    crond.add(t, partial(update_label, 'Oscillating partial ring'))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.centerx, 50),
-                         bullet_source=pe.BulletSource(
-                             bullets=5,
-                             ring=pe.Ring(50, 5, width=30),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=200, fade=1),
-                         rotation=LerpThing(165, 15, 2, repeat=2),
-                         lifetime=7.95))
+    crond.add(t, partial(set_label, 'Oscillating partial ring'))
+    spawn('oscillating')
     t += 8
 
-    crond.add(t, partial(update_label, 'Aiming partial ring'))
+    crond.add(t, partial(set_label, 'Aiming partial ring'))
     crond.add(t, partial(ecs.add_component, target, 'circle', (16, 'red')))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.centerx, 50),
-                         bullet_source=pe.BulletSource(
-                             bullets=5,
-                             ring=pe.Ring(50, 5, aim=-30, width=30),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=200, fade=1),
-                         lifetime=7.95,
-                         target=target))
+    spawn('aiming')
     t += 8
 
     crond.add(t, partial(ecs.remove_component, target, 'circle'))
-    crond.add(t, partial(update_label, 'Static ring, turning bullets'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=16,
-                             ring=pe.Ring(250, 8),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['cyan'], speed=150, lifetime=4, angular_momentum=90, fade=1),
-                         # rotation=LerpThing(0, 360, 16, repeat=1),
-                         lifetime=3.95))
+    crond.add(t, partial(set_label, 'Static ring, turning bullets'))
+    spawn('turning-bullets')
     t += 8
 
-    crond.add(t, partial(update_label, 'Slow turning bullets, negative speed'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=16,
-                             ring=pe.Ring(250, 16),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['cyan'], speed=-150, lifetime=8, angular_momentum=15, fade=1),
-                         lifetime=7.95))
+    crond.add(t, partial(set_label, 'Slow turning bullets, negative speed'))
+    spawn('turning-bullets-slow')
     t += 8
 
-    crond.add(t, partial(update_label, 'Fast turning bullets, negative speed'))
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=16,
-                             ring=pe.Ring(100, 16),
-                             heartbeat=pe.Heartbeat(1, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=-150, lifetime=8, angular_momentum=45, fade=3),
-                         lifetime=8))
+    crond.add(t, partial(set_label, 'Fast turning bullets, negative speed'))
+    spawn('turning-bullets-fast')
     t += 16
 
-    crond.add(t, partial(update_label, 'Rotating 5 step ring in motion'))
-    crond.add(t, partial(pattern_factory,
-                         position=(50, 50),
-                         momentum=Vector2(1024, 768).normalize() * 100,
-                         bullet_source=pe.BulletSource(
-                             bullets=5,
-                             ring=pe.Ring(50, 5),
-                             heartbeat=pe.Heartbeat(1, '#.#.#.#.#.#.#.#.')),
-                         bullet_factory=partial(BULLET_FACTORIES['yellow'], speed=10, lifetime=8, fade=3),
-                         fade=1,
-                         rotation=LerpThing(0, 360, 8, repeat=1),
-                         lifetime=16))
+    crond.add(t, partial(set_label, 'Rotating 5 step ring in motion'))
+    spawn('moving-ring')
     t += 16
 
-    crond.add(t, partial(update_label, 'Is python too slow?'))
-    crond.add(t, partial(pattern_factory,
-                         position=(100, 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=8,
-                             ring=pe.Ring(25, 8),
-                             heartbeat=pe.Heartbeat(2, '###.............')),
-                         bullet_factory=partial(BULLET_FACTORIES['cyan'], speed=100),
-                         lifetime=47.95))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.width - 100, 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=8,
-                             ring=pe.Ring(25, 8),
-                             heartbeat=pe.Heartbeat(2, '###.............')),
-                         bullet_factory=partial(BULLET_FACTORIES['cyan'], speed=100),
-                         lifetime=47.95))
+    crond.add(t, partial(set_label, 'Is python too slow?'))
+    spawn('stress-1-left', 'stress-1-right')
     t += 8
 
-    crond.add(t, partial(pattern_factory,
-                         position=(100, 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=36,
-                             ring=pe.Ring(50, 36),
-                             heartbeat=pe.Heartbeat(2, '........#.......')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=100),
-                         lifetime=39.95))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.width - 100, 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=36,
-                             ring=pe.Ring(50, 36),
-                             heartbeat=pe.Heartbeat(2, '........#.......')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=100),
-                         lifetime=39.95))
+    spawn('stress-2-left', 'stress-2-right')
     t += 8
 
-    crond.add(t, partial(pattern_factory,
-                         position=(100, 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=36,
-                             ring=pe.Ring(50, 36),
-                             heartbeat=pe.Heartbeat(2, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=100),
-                         lifetime=37.95))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.width - 100, 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=36,
-                             ring=pe.Ring(50, 36),
-                             heartbeat=pe.Heartbeat(2, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=100),
-                         lifetime=37.95))
+    spawn('stress-3-left', 'stress-3-right')
     t += 4
 
-    crond.add(t, partial(pattern_factory,
-                         position=(100, 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=36,
-                             ring=pe.Ring(50, 36),
-                             heartbeat=pe.Heartbeat(2, '#.#.#.#.#.#.#.#.')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=100),
-                         lifetime=33.95))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.width - 100, 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=36,
-                             ring=pe.Ring(50, 36),
-                             heartbeat=pe.Heartbeat(2, '#.#.#.#.#.#.#.#.')),
-                         bullet_factory=partial(BULLET_FACTORIES['hotpink'], speed=100),
-                         lifetime=33.95))
+    spawn('stress-4-left', 'stress-4-right')
     t += 4
 
-    crond.add(t, partial(pattern_factory,
-                         position=(100, rect.height - 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=10,
-                             ring=pe.Ring(30, 10),
-                             heartbeat=pe.Heartbeat(2, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=100, angular_momentum=45, lifetime=10),
-                         lifetime=29.95))
-    crond.add(t, partial(pattern_factory,
-                         position=(rect.width - 100, rect.height - 100),
-                         bullet_source=pe.BulletSource(
-                             bullets=10,
-                             ring=pe.Ring(30, 10),
-                             heartbeat=pe.Heartbeat(2, '#...#...#...#...')),
-                         bullet_factory=partial(BULLET_FACTORIES['green'], speed=100, angular_momentum=45, lifetime=10),
-                         lifetime=29.95))
+    spawn('stress-5-left', 'stress-5-right')
     t += 8
 
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=16,
-                             ring=pe.Ring(100, 16),
-                             heartbeat=pe.Heartbeat(2, '#.#.#.#.#.#.#.#.')),
-                         bullet_factory=partial(BULLET_FACTORIES['yellow'], speed=100, fade=1),
-                         rotation=LerpThing(0, 360, 5, repeat=1),
-                         lifetime=21.95))
+    spawn('stress-6')
     t += 8
 
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=8,
-                             ring=pe.Ring(100, 8),
-                             heartbeat=pe.Heartbeat(1, '#.#.#.#.#.#.#.#.')),
-                         bullet_factory=partial(BULLET_FACTORIES['lightblue'], speed=-100, angular_momentum=10, fade=1),
-                         rotation=LerpThing(0, 360, 5, repeat=1),
-                         lifetime=13.95))
+    spawn('stress-7')
     t += 8
 
-    crond.add(t, partial(pattern_factory,
-                         position=rect.center,
-                         bullet_source=pe.BulletSource(
-                             bullets=6,
-                             ring=pe.Ring(0, 6),
-                             heartbeat=pe.Heartbeat(2, '################')),
-                         bullet_factory=partial(BULLET_FACTORIES['red'], speed=150, angular_momentum=35, lifetime=16),
-                         rotation=LerpThing(0, 360, 4, repeat=1),
-                         lifetime=8))
+    spawn('stress-8')
     t += 24
 
-    crond.add(t, partial(update_label, ''))
+    crond.add(t, partial(set_label, ''))
     t += 3
     return t
 
@@ -549,14 +642,12 @@ class Demo(GameState):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.bgcolor = pygame.Color('black')
-        self.bgcrit = pygame.Color('red')
+        prepare_assets()
+
+        self.background = Background(self.app.rect.size, 'black', 'red')
 
         self.group = FBlitGroup()
-        self.target = ecs.create_entity('target')
-        ecs.add_component(self.target, 'position', Vector2(self.app.rect.center))
-        ecs.add_component(self.target, 'momentum', Vector2(1, 0).rotate(random() * 30 + 15) * 100)
-        ecs.add_component(self.target, 'bounce', True)
+        self.target = 'target'
 
         self.label = TextSprite((self.app.rect.centerx, 50), self.group)
         self.slowest = TextSprite((self.app.rect.centerx, self.app.rect.centery - 50), self.group)
@@ -564,17 +655,38 @@ class Demo(GameState):
 
         self.countdown = TextSprite(self.app.rect.center, self.group, size=128)
 
-        self.countdown_text = None
+        self.countdown_index = 0
         self.countdown_cooldown = Cooldown(1, cold=True)
         self.post_countdown = False
 
         self.deadzone = self.app.rect.scale_by(1.5)
+        # Bullets are still partially visible when their center is outside.
+        self.view = self.app.rect.inflate(64, 64)
+
+        self.app.metrics.sinks.append(self.track_stats)
+
+        self.watcher = (DictWatcher(patterns, 'PATTERNS',
+                                    validate=partial(build_pattern, rect=self.app.rect, target=self.target))
+                        if self.persist.watch else None)
+
+        if self.persist.renderer == 'gl':
+            sprite_group.renderer = create_renderer(self.app.rect.size)
+
+        self.pause = Pause(self.app, self.persist, parent=self)
+
+        codec.register('demo', self)
+        codec.register('label', self.label)
 
         self.reset()
 
     def update_label(self, s):
         self.label.text = s
 
+    def purge(self):
+        """Remove all entities and scheduled jobs."""
+        clear_world()
+        crond.heap.clear()
+
     def reset(self, *args, **kwargs):
         super().reset(*args, **kwargs)
 
@@ -584,30 +696,102 @@ class Demo(GameState):
         }
 
         self.label.text = ''
+        self.app.gameclock.scale = 1.0
 
-        self.countdown_text = iter(['3', '2', '1', 'Go!'])
-        self.countdown.text = next(self.countdown_text)
+        self.countdown_index = 0
+        self.countdown.text = COUNTDOWN[0]
         self.countdown_cooldown.reset()
         self.post_countdown = False
         self.group.add(self.countdown)
 
-        rect = self.app.rect
+        self.purge()
 
-        crond.heap.clear()
-        t = 3
-        t = schedule_demo(t, self.label, rect, self.target)
+        ecs.create_entity(self.target)
+        ecs.add_component(self.target, 'position', Vector2(self.app.rect.center))
+        ecs.add_component(self.target, 'momentum', Vector2(1, 0).rotate(random() * 30 + 15) * 100)
+        ecs.add_component(self.target, 'bounce', True)
+        ecs.add_component(self.target, 'targetable', True)
 
-        def show_stats():
-            self.slowest.text = f'Slowest: {self.stats["slowest"][1]} Sprites at {self.stats["slowest"][0]} FPS'
-            self.most.text = f'Most: {self.stats["most"][1]} Sprites at {self.stats["most"][0]} FPS'
+        t = 3
+        t = schedule_demo(t, self.label, self.app.rect, self.target)
 
-        crond.add(t, show_stats)
+        crond.add(t, self.show_stats)
         t += 5
 
-        def done():
-            raise SystemExit
+        crond.add(t, self.done)
+
+    def show_stats(self):
+        self.slowest.text = (f'Slowest: {self.stats["slowest"][1]} Sprites (median)'
+                             f' at {self.stats["slowest"][0]} FPS (5th percentile)')
+        self.most.text = (f'Most: {self.stats["most"][1]} Sprites (median)'
+                          f' at {self.stats["most"][0]} FPS (5th percentile)')
+
+    def done(self):
+        raise SystemExit
+
+    def snapshot(self):
+        """Capture all entities, the timeline and the texts.
+
+        See `snapshot.Codec` for what components can be captured.
+        """
+        heap = crond.heap
+        return codec.dump_world(
+            extra=dict(
+                countdown=(self.countdown_index, self.countdown_cooldown, self.post_countdown),
+                texts=(self.label.text, self.slowest.text, self.most.text),
+                stats=self.stats,
+            ),
+            columns=dict(
+                cooldown=[job.cooldown for job in heap],
+                task=[job.task for job in heap],
+                repeat=[job.repeat for job in heap],
+            ))
+
+    def restore(self, data):
+        state, jobs = codec.load_world(data)
+
+        # Already in heap order
+        crond.heap[:] = map(Cronjob, jobs['cooldown'], jobs['task'], jobs['repeat'])
+
+        self.countdown_index, self.countdown_cooldown, self.post_countdown = state['countdown']
+        if self.post_countdown:
+            self.countdown.kill()
+        else:
+            self.countdown.text = COUNTDOWN[self.countdown_index]
+            self.group.add(self.countdown)
+
+        self.label.text, self.slowest.text, self.most.text = state['texts']
+        self.stats = state['stats']
+
+    def dispatch_event(self, e):
+        super().dispatch_event(e)
+
+        clock = self.app.gameclock
+        match e.type:
+            case pygame.KEYDOWN if e.key == pygame.K_p:
+                self.pause.reset(self.persist)
+                self.app.push(self.pause)
+            case pygame.KEYDOWN if e.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                clock.scale = max(clock.scale / 2, TIME_SCALE[0])
+            case pygame.KEYDOWN if e.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                clock.scale = min(clock.scale * 2, TIME_SCALE[1])
+            case pygame.KEYDOWN if e.key == pygame.K_0:
+                clock.scale = 1.0
+
+    def track_stats(self, report):
+        # Both values describe the same window: the sprite count it typically
+        # had, and the frame rate of its slowest 5% of frames.
+        if 'sprites' not in report:
+            return
 
-        crond.add(t, done)
+        fps = self.app.metrics.percentile('fps', 5)
+        sprites = report['sprites'].p50
+        if fps and sprites > 100 and fps < self.stats['slowest'][0]:
+            self.stats['slowest'][0] = int(fps)
+            self.stats['slowest'][1] = sprites
+        if sprites > self.stats['most'][1] and fps > 58:
+            self.stats['most'][0] = int(fps)
+            self.stats['most'][1] = sprites
 
     def do_countdown(self):
         if self.post_countdown:
@@ -616,13 +800,13 @@ class Demo(GameState):
         if self.countdown_cooldown:
             return
 
-        try:
-            self.countdown.text = next(self.countdown_text)
-        except StopIteration:
+        self.countdown_index += 1
+        if self.countdown_index == len(COUNTDOWN):
             self.post_countdown = True
             self.countdown.kill()
             return
 
+        self.countdown.text = COUNTDOWN[self.countdown_index]
         self.countdown_cooldown.reset()
 
     def update(self, dt):
@@ -647,27 +831,45 @@ class Demo(GameState):
                 position.y = 2 * self.app.rect.height - position.y
                 momentum.y = -momentum.y
 
-        def fade_system(dt, eid, fade, rsai):
-            rsai.alpha = fade()
-            if fade.duration.cold():
+        def fade_system(rows):
+            # Under overload, skip the intermediate alpha variants, but always
+            # set the final one.  Offscreen bullets are skipped, they catch up
+            # once they're back in view.
+            alphas, finished = lerp_batch([fade for _, (fade, _, _) in rows])
+            if sprite_group.lod < 1:
+                for (_, (_, rsai, _)), alpha in zip(rows, alphas):
+                    rsai.alpha = alpha
+            for i in finished:
+                eid, (_, rsai, _) = rows[i]
+                rsai.alpha = alphas[i]
                 ecs.remove_component(eid, 'fade')
 
+        def rotate_system(rows):
+            angles, _ = lerp_batch([rotation for _, (_, rotation) in rows])
+            for (_, (bullet_source, _)), angle in zip(rows, angles):
+                bullet_source.aim = angle
+
         def angular_momentum_system(dt, eid, angular_momentum, momentum):
             v = glm.rotate(momentum, glm.radians(angular_momentum * dt))
             momentum.xy = v.xy
             # momentum.rotate_ip(angular_momentum * dt)
 
+        if self.watcher and (changed := self.watcher.poll()):
+            swap_patterns(changed, self.app.rect, self.target)
+
         crond.update()
 
-        ecs.run_system(dt, fade_system, 'fade', 'rsai')
-        ecs.run_system(dt, pecs.aim_ring_system, 'bullet_source', 'position', 'target')
-        ecs.run_system(dt, pecs.bullet_source_rotate_system, 'bullet_source', 'rotation')
+        fade_system(archetype_rows('fade', 'rsai', 'sprite'))
+        ecs.run_system(dt, pattern_swap_system, 'pattern-swap', 'bullet_source')
+        aim_system(archetype_rows('bullet_source', 'position', 'target'))
+        rotate_system(archetype_rows('bullet_source', 'rotation'))
         ecs.run_system(dt, pecs.bullet_source_system, 'bullet_source', 'bullet_factory', 'position')
         ecs.run_system(dt, angular_momentum_system, 'angular_momentum', 'momentum')
         ecs.run_system(dt, bounce_system, 'bounce', 'position', 'momentum')
         ecs.run_system(dt, ecsc.momentum_system, 'momentum', 'position')
+        ecs.run_system(dt, uncull_system, 'world', 'position', 'offscreen', view=self.view, deadzone=self.deadzone)
+        ecs.run_system(dt, cull_system, 'world', 'position', 'sprite', view=self.view, deadzone=self.deadzone)
         ecs.run_system(dt, ecsc.sprite_system, 'sprite', 'position')
-        ecs.run_system(dt, ecsc.deadzone_system, 'world', 'position', container=self.deadzone)
         ecs.run_system(dt, ecsc.lifetime_system, 'lifetime')
 
     def draw(self, screen):
@@ -679,16 +881,10 @@ class Demo(GameState):
         def circle_system(dt, eid, circle, position):
             pygame.draw.circle(screen, circle[1], position, circle[0], width=1)
 
-        runtime = pygame.time.get_ticks() / 1000
-        sprites = len(sprite_group)
         fps = self.app.clock.get_fps()
 
-        if fps:
-            bgcolor = self.bgcolor.lerp(self.bgcrit, 1 - (min(self.app.fps, fps) / self.app.fps))
-        else:
-            bgcolor = self.bgcolor
-
-        screen.fill(bgcolor)
+        self.background.select(1 - min(self.app.fps, fps) / self.app.fps if fps else 0)
+        self.background.draw(screen)
 
         sprite_group.draw(screen)
         self.group.draw(screen)
@@ -696,11 +892,7 @@ class Demo(GameState):
         # ecs.run_system(0, lifetime_display, 'lifetime-display', 'lifetime', 'position')
         ecs.run_system(0, circle_system, 'circle', 'position')
 
-        if fps and sprites > 100 and fps < self.stats['slowest'][0]:
-            self.stats['slowest'][0] = int(fps)
-            self.stats['slowest'][1] = sprites
-        if sprites > self.stats['most'][1] and fps > 58:
-            self.stats['most'][0] = int(fps)
-            self.stats['most'][1] = sprites
-
-        pygame.display.set_caption(f'{self.app. title} - {runtime=:.2f}  {fps=:.2f}  {sprites=}')
+        self.app.metrics.gauge('sprites', len(sprite_group))
+        self.app.metrics.gauge('offscreen', len(archetype_rows('offscreen')))
+        if sprite_group.renderer is None:
+            self.app.metrics.gauge('lod', sprite_group.lod)
@@ -0,0 +1,81 @@
+"""Tabulated easing and batch evaluation of `LerpThing`s.
+
+Calling a `LerpThing` goes through its `Cooldown`'s properties and the easing
+function, for every entity, every frame.  `lerp_batch` evaluates a whole list
+of them in one pass instead, reading the timing straight from the game clock
+and the easing from a table that is sampled once per easing function.
+
+Only the common case, a running lerp, is done from the tables.  Lerps that are
+paused, not started or have run out, are called as usual, so repeats, loop
+counting and the final value behave exactly like `LerpThing.__call__`.
+"""
+from array import array
+from operator import attrgetter
+
+from patternengine_demo.framework import gameclock
+
+__all__ = ['SAMPLES', 'ease_table', 'lerp_batch']
+
+SAMPLES = 4096  # intervals per table
+
+_tables = {}
+_ease = attrgetter('ease')
+
+
+def ease_table(ease):
+    """The easing function `ease` sampled at `SAMPLES + 1` points in [0, 1].
+
+    Tables are cached per function.
+    """
+    try:
+        return _tables[ease]
+    except KeyError:
+        table = _tables[ease] = array('d', (ease(i / SAMPLES) for i in range(SAMPLES + 1)))
+        return table
+
+
+def lerp_batch(lerps):
+    """Evaluate a sequence of `timers.LerpThing`s.
+
+    The easing is looked up from the nearest lower table sample.
+
+    Parameters
+    ----------
+    lerps : Sequence[timers.LerpThing]
+
+    Returns
+    -------
+    tuple[list[float], list[int]]
+        The current values, and the indices of the lerps that are finished, see
+        `LerpThing.finished`.
+
+    """
+    now = gameclock.now
+    eases = set(map(_ease, lerps))
+    tables = {ease: ease_table(ease) for ease in eases}
+
+    # Usually, all lerps share one easing, so the table lookup is hoisted.
+    if len(eases) == 1:
+        table = tables.popitem()[1]
+        values = [lt.vt0 + (lt.vt1 - lt.vt0) * table[int(x)]
+                  if ((d := lt.duration).duration and not d.paused
+                      and 0 <= (x := (now - d.t0) * SAMPLES / d.duration) < SAMPLES)
+                  else None
+                  for lt in lerps]
+    else:
+        values = [lt.vt0 + (lt.vt1 - lt.vt0) * tables[lt.ease][int(x)]
+                  if ((d := lt.duration).duration and not d.paused
+                      and 0 <= (x := (now - d.t0) * SAMPLES / d.duration) < SAMPLES)
+                  else None
+                  for lt in lerps]
+
+    finished = []
+    if None in values:
+        for i, value in enumerate(values):
+            if value is None:
+                lt = lerps[i]
+                values[i] = lt()
+                if lt.finished():
+                    finished.append(i)
+
+    return values, finished
@@ -1,13 +1,61 @@
+import asyncio
+import marshal
 import pygame
+import random
+import struct
 
 from abc import ABC, abstractmethod
+from collections import deque
+from time import perf_counter
 from types import SimpleNamespace
 
-__all__ = ['App', 'GameState']
+__all__ = ['App', 'GameClock', 'GameState', 'Metrics', 'OverlaySink',
+           'caption_sink', 'file_sink', 'format_report', 'gameclock',
+           'stdout_sink']
 
 QUIT = 'QUIT'
 
 
+class GameClock:
+    """Simulation time.
+
+    Wall clock time keeps running, no matter what the simulation does.  This
+    clock only advances by the `dt` of the frames that were actually
+    simulated, so e.g. a replay can run faster than real time and still end
+    up in the same state.
+
+    There is one shared instance, `gameclock`, advanced by `App.update`.  It
+    stands still while a substate is pushed, e.g. a pause screen.
+
+    All timers read `now` instead of keeping their own state, so stopping or
+    scaling the clock affects all of them at once, no matter how many there
+    are.
+
+    Attributes
+    ----------
+    now : float
+        Seconds of simulation time since start.
+    scale : float = 1
+        Simulation seconds per real second, e.g. 0.5 for slow motion.
+
+    """
+    def __init__(self):
+        self.now = 0.0
+        self.scale = 1.0
+
+    def advance(self, dt):
+        """Move the clock forward by `dt` real seconds.
+
+        Returns the scaled `dt` that actually passed.
+        """
+        dt *= self.scale
+        self.now += dt
+        return dt
+
+
+gameclock = GameClock()
+
+
 class App:
     """A pygame application framework.
 
@@ -31,6 +79,12 @@ class App:
     FPS : int
         The wanted frames per second for the game loop.
 
+    metrics_rate : float = 1
+        How often per second the metrics are published to their sinks.
+
+    metrics_samples : int = 256
+        The number of frames kept in the metrics ring buffers.
+
     Attributes
     ----------
     screen : pygame.display.Surface
@@ -45,9 +99,20 @@ class App:
         Copy of `fps` from the class initialization.
     running : bool = True
         Set this to `False` from the GameState to end the application.
+    metrics : Metrics
+        Frame metrics.  `fps` and `frame` (the time in ms spent in the last
+        frame, excluding the wait for the next one) are sampled by the App,
+        GameStates can add their own gauges.  The window caption is a sink of
+        this by default.
+    gameclock : GameClock
+        The shared simulation clock.
+    replay : object = None
+        A `replay.Recorder` or `replay.Player`.  If set, it's called at the
+        start of every frame with `replay.frame(app, dt, events)` and returns
+        the `(dt, events)` to actually use.
 
     """
-    def __init__(self, title, screen, fps):
+    def __init__(self, title, screen, fps, metrics_rate=1, metrics_samples=256):
         """Initialize the app framework."""
         self.title = title
         self.screen = pygame.display.set_mode(screen.size)
@@ -56,9 +121,14 @@ class App:
         self.clock = pygame.time.Clock()
         self.fps = fps
         self.running = True
+        self.metrics = Metrics(metrics_rate, metrics_samples,
+                               sinks=[lambda report: caption_sink(report, self.title)])
+        self.gameclock = gameclock
+        self.replay = None
 
         self._states = None
         self._state = None
+        self._state_key = None
         self._state_stack = []
         self._dt_max = 3 / fps
 
@@ -83,12 +153,16 @@ class App:
                 return
 
         # We do have a follow up state
+        self._state_key = state
         self._state = self._states[state]
         self._state.reset(persist)
 
-    def dispatch_events(self):
-        """Delegate events to current state."""
-        for e in pygame.event.get():
+    def dispatch_events(self, events=None):
+        """Delegate events to current state.
+
+        If `events` is not given, they are fetched from pygame.
+        """
+        for e in pygame.event.get() if events is None else events:
             self._state.dispatch_event(e)
 
     def update(self, dt):
@@ -98,7 +172,13 @@ class App:
 
         If the current state returns a tuple of (next_state, persist), switch
         states.
+
+        The `gameclock` is advanced by `dt` before the state is updated, and
+        the state receives the scaled `dt`.  While a substate is pushed, the
+        clock stands still, and the substate gets the unscaled `dt`.
         """
+        if not self._state_stack:
+            dt = self.gameclock.advance(dt)
         res = self._state.update(dt)
 
         if not self._state.running:
@@ -112,20 +192,108 @@ class App:
     def draw(self):
         """Call draw method of current state."""
         self._state.draw(self.screen)
+        self.metrics.draw(self.screen)
 
-    def run(self, state, states):
-        """The game loop."""
+    def frame(self, dt):
+        """Run a single frame: events, update, draw, flip, metrics."""
+        t0 = perf_counter()
+
+        events = pygame.event.get()
+        if self.replay:
+            dt, events = self.replay.frame(self, dt, events)
+
+        self.dispatch_events(events)
+        self.update(dt)
+        self.draw()
+
+        pygame.display.flip()
+
+        self.metrics.gauge('fps', self.clock.get_fps())
+        self.metrics.gauge('frame', (perf_counter() - t0) * 1000)
+        self.metrics.update()
 
+    def start(self, state, states):
+        """Make `states[state]` the current state, without a game loop.
+
+        `run` and `run_async` call this themselves.  Use it directly to drive
+        the app with `frame`, e.g. headless in benchmarks or tests.
+        """
         self._states = states
+        self._state_key = state
         self._state = self._states[state]
-        while self.running:
-            dt = min(self.clock.tick(self.fps) / 1000.0, self._dt_max)
 
-            self.dispatch_events()
-            self.update(dt)
-            self.draw()
+    def run(self, state, states):
+        """The game loop."""
+        self.start(state, states)
+        try:
+            while self.running:
+                dt = min(self.clock.tick(self.fps) / 1000.0, self._dt_max)
+                self.frame(dt)
+        finally:
+            if self.replay:
+                self.replay.close()
+
+        pygame.quit()
+
+    async def run_async(self, state, states, spin=0.001):
+        """The game loop as a coroutine.
+
+        Use this instead of `run` to host the app together with other asyncio
+        tasks:
+
+            async def main():
+                asyncio.create_task(upload_telemetry())
+                await app.run_async(States.TITLE, states)
+
+            asyncio.run(main())
+
+        Frames are paced against `loop.time()`.  The time until the next frame
+        is yielded to other tasks with `asyncio.sleep`, but since the event
+        loop wakes up imprecisely, the last `spin` seconds are busy waited.
+        If a frame is late, pacing restarts from now instead of trying to
+        catch up.
+
+        Note: other tasks must not block longer than the frame slack, or
+        frames will be late.
+
+        Parameters
+        ----------
+        state, states
+            See `run`.
 
-            pygame.display.flip()
+        spin : float = 0.001
+            Seconds before the frame deadline to stop sleeping and spin.
+
+        """
+        loop = asyncio.get_running_loop()
+        period = 1 / self.fps
+
+        self.start(state, states)
+
+        last = loop.time()
+        deadline = last + period
+        try:
+            while self.running:
+                slack = deadline - loop.time() - spin
+                # Always yield at least once, so other tasks aren't starved if
+                # frames take too long.
+                await asyncio.sleep(max(slack, 0))
+                while loop.time() < deadline:
+                    pass
+
+                now = loop.time()
+                dt = min(now - last, self._dt_max)
+                last = now
+                deadline += period
+                if deadline < now:
+                    deadline = now + period
+
+                # No framerate, so tick doesn't delay.  Still needed for get_fps.
+                self.clock.tick()
+                self.frame(dt)
+        finally:
+            if self.replay:
+                self.replay.close()
 
         pygame.quit()
 
@@ -136,11 +304,215 @@ class App:
 
         once the sub state finishes, control is returned to the previous state.
         persist is merged to provide results.
+
+        The `gameclock` stands still until then.
         """
 
         self._state_stack.append(self._state)
         self._state = substate
 
+    def snapshot(self):
+        """Capture the simulation state as bytes.
+
+        This contains the current state, the `gameclock` and its scale, the
+        state of the `random` module and whatever `GameState.snapshot`
+        returns.
+
+        Returns `None` if the current state doesn't support snapshots, or a
+        substate is pushed.
+        """
+        if self._state_stack or self._state_key is None:
+            return None
+
+        data = self._state.snapshot()
+        if data is None:
+            return None
+
+        head = marshal.dumps((list(self._states).index(self._state_key),
+                              self.gameclock.now,
+                              self.gameclock.scale,
+                              random.getstate()))
+        return struct.pack('<I', len(head)) + head + data
+
+    def restore(self, snapshot):
+        """Restore a snapshot taken by `App.snapshot`."""
+        size, = struct.unpack_from('<I', snapshot)
+        index, now, scale, rng = marshal.loads(snapshot[4:4 + size])
+
+        self._state_stack.clear()
+        self._state_key = list(self._states)[index]
+        self._state = self._states[self._state_key]
+
+        self.gameclock.now = now
+        self.gameclock.scale = scale
+        random.setstate(rng)
+        self._state.restore(memoryview(snapshot)[4 + size:])
+
+
+class Metrics:
+    """Sampled frame metrics.
+
+    Every gauge is a ring buffer of the last `samples` values.  Pushing a value
+    is cheap and can be done every frame.  The expensive part, computing the
+    statistics and e.g. setting the window caption, is only done `rate` times
+    per second, when a report is published to all sinks.
+
+    A report is a dict of gauge name to a `SimpleNamespace` with the
+    attributes `last`, `min`, `mean`, `p50`, `p95`, `p99` and `max` over the
+    current window.
+
+    Parameters
+    ----------
+    rate : float = 1
+        Reports per second.
+
+    samples : int = 256
+        Size of the ring buffers.
+
+    sinks : list[callable] = None
+        Callables receiving the report.  If a sink also has a `draw(screen)`
+        method, it is called every frame by `Metrics.draw`, e.g. to show the
+        last report as an overlay.  `draw` may return the rect it drew to.
+
+    Attributes
+    ----------
+    gauges : dict[str, collections.deque]
+        The ring buffers.
+    sinks : list[callable]
+        See above.  Feel free to append or remove sinks at any time.
+    dirty : list[pygame.Rect]
+        The rects the sinks drew to in the last `draw`.
+
+    """
+    def __init__(self, rate=1, samples=256, sinks=None):
+        self.interval = 1000 / rate
+        self.samples = samples
+        self.sinks = sinks if sinks is not None else []
+        self.gauges = {}
+        self.dirty = []
+
+        self._next_publish = pygame.time.get_ticks() + self.interval
+
+    def gauge(self, name, value):
+        """Push `value` into the ring buffer `name`."""
+        try:
+            self.gauges[name].append(value)
+        except KeyError:
+            self.gauges[name] = deque([value], maxlen=self.samples)
+
+    def percentile(self, name, p):
+        """The `p`th percentile (0-100) of gauge `name` in the current window."""
+        return _percentile(sorted(self.gauges[name]), p)
+
+    def report(self):
+        """Compute statistics for all gauges."""
+        report = {}
+        for name, ring in self.gauges.items():
+            values = sorted(ring)
+            report[name] = SimpleNamespace(
+                last=ring[-1],
+                min=values[0],
+                mean=sum(values) / len(values),
+                p50=_percentile(values, 50),
+                p95=_percentile(values, 95),
+                p99=_percentile(values, 99),
+                max=values[-1],
+            )
+        return report
+
+    def publish(self):
+        """Send a report to all sinks right away."""
+        if not self.gauges:
+            return
+
+        report = self.report()
+        for sink in self.sinks:
+            sink(report)
+
+    def update(self):
+        """Publish if the reporting interval has passed."""
+        now = pygame.time.get_ticks()
+        if now < self._next_publish:
+            return
+
+        self._next_publish = now + self.interval
+        self.publish()
+
+    def draw(self, screen):
+        """Give sinks with a `draw` method a chance to render."""
+        self.dirty = [rect for sink in self.sinks
+                      if hasattr(sink, 'draw') and (rect := sink.draw(screen))]
+
+
+def _percentile(values, p):
+    """Nearest rank percentile of an already sorted sequence."""
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def format_report(report):
+    """Condense a metrics report into a single line."""
+    parts = []
+    for name, g in report.items():
+        if g.min == g.max:
+            parts.append(f'{name}={g.last:.5g}')
+        else:
+            parts.append(f'{name}={g.last:.5g} (p50={g.p50:.5g} p99={g.p99:.5g} max={g.max:.5g})')
+    return '  '.join(parts)
+
+
+def caption_sink(report, title):
+    """Show the report in the window caption."""
+    runtime = pygame.time.get_ticks() / 1000
+    pygame.display.set_caption(f'{title} - {runtime=:.2f}  {format_report(report)}')
+
+
+def stdout_sink(report):
+    """Print the report."""
+    print(f'{pygame.time.get_ticks() / 1000:.2f}: {format_report(report)}')
+
+
+def file_sink(report, path):
+    """Append the report as a single line to the file at `path`.
+
+    Use a `functools.partial` to set the path.
+    """
+    with open(path, 'a') as f:
+        print(f'{pygame.time.get_ticks() / 1000:.2f}: {format_report(report)}', file=f)
+
+
+class OverlaySink:
+    """Render the last report on top of the screen.
+
+    The text is only rendered when a report comes in, drawing it every frame
+    is a single blit.
+
+    Parameters
+    ----------
+    pos : tuple[int, int] = (4, 4)
+        The topleft position of the overlay.
+
+    size : int = 20
+        The font size.
+    """
+    def __init__(self, pos=(4, 4), size=20):
+        self.pos = pos
+        self.font = pygame.font.Font(None, size)
+        self.image = None
+
+    def __call__(self, report):
+        lines = [self.font.render(f'{name}: {g.last:.2f}  p50 {g.p50:.2f}  p99 {g.p99:.2f}  max {g.max:.2f}',
+                                  True, 'white')
+                 for name, g in report.items()]
+        width = max(line.get_width() for line in lines)
+        height = self.font.get_linesize()
+        self.image = pygame.Surface((width, height * len(lines)), flags=pygame.SRCALPHA)
+        for i, line in enumerate(lines):
+            self.image.blit(line, (0, i * height))
+
+    def draw(self, screen):
+        if self.image:
+            return screen.blit(self.image, self.pos)
+
 
 class GameState(ABC):
     """The base class for game states
@@ -174,6 +546,12 @@ class GameState(ABC):
 
         The display is flipped by the framework, but an initial fill with e.g.
         black is the job of the state class.
+
+    snapshot(), restore(data):
+
+        Optional.  Capture the simulation state as bytes and restore it, e.g.
+        for seeking in replays.  The default `snapshot` returns None, meaning
+        not supported.
     """
 
     def __init__(self, app, persist, parent=None):
@@ -199,6 +577,17 @@ class GameState(ABC):
         if persist:
             self.persist = persist
 
+    def snapshot(self):
+        """Return the simulation state as bytes, or None if not supported.
+
+        See `App.snapshot`.
+        """
+        return None
+
+    def restore(self, data):
+        """Restore the state from the bytes returned by `snapshot`."""
+        raise NotImplementedError
+
     def dispatch_event(self, e):
         """Handle user events"""
         if (e.type == pygame.QUIT or
@@ -0,0 +1,207 @@
+"""Draw the bullets of a `demo.FBlitGroup` with OpenGL.
+
+Every bullet image is uploaded once as a texture.  Per frame, the bullets'
+positions, alpha and rotation are written into a per-image instance buffer,
+and all bullets sharing an image are drawn with a single instanced call.
+
+The bullets are rendered into an offscreen framebuffer of a standalone
+context, which is read back into a surface and blitted over the screen.  So
+the rest of the demo keeps drawing with pygame, and no GL capable window or
+GPU is needed: with Mesa's llvmpipe, this runs headless.
+
+`moderngl` is optional.  `create_renderer` returns `None` if it's missing or
+no context can be created, and the group keeps blitting.
+
+Sprites with an `RSAImage` as `image_factory` (`EVSprite`) are drawn from
+their base image with the `RSAImage`'s alpha and rotation, `scale` is not
+supported.  Other dynamic sprites are blitted on top.  The level of detail of
+the group is not applied, bullets are always drawn in full detail.  Bullets
+are drawn image by image, so where bullets of different images overlap, the
+stacking order can differ from blitting.
+"""
+from array import array
+from collections import defaultdict
+from functools import partial
+from itertools import chain
+from math import radians
+
+import pygame
+
+try:
+    import moderngl
+except ImportError:
+    moderngl = None
+
+__all__ = ['GLRenderer', 'create_renderer']
+
+VERTEX_SHADER = """
+#version 330
+
+uniform vec2 screen;
+uniform vec2 size;
+
+in vec2 corner;
+in vec2 position;
+in float alpha;
+in float angle;
+
+out vec2 uv;
+out float v_alpha;
+
+void main() {
+    vec2 p = corner * size;
+    float c = cos(angle);
+    float s = sin(angle);
+    p = vec2(p.x * c + p.y * s, -p.x * s + p.y * c) + position;
+
+    // Screen row 0 goes to framebuffer row 0, so the pixels read back are
+    // already in the row order of a pygame surface.
+    gl_Position = vec4(p / screen * 2.0 - 1.0, 0.0, 1.0);
+    uv = corner + 0.5;
+    v_alpha = alpha;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D image;
+
+in vec2 uv;
+in float v_alpha;
+
+out vec4 color;
+
+void main() {
+    vec4 c = texture(image, uv);
+    c.a *= v_alpha;
+    color = vec4(c.rgb * c.a, c.a);  // premultiplied
+}
+"""
+
+INSTANCE = array('f').itemsize * 4  # x, y, alpha, angle
+RESERVE = 1024  # initial instances per buffer
+
+# A unit quad, centered on the origin, as triangle strip.
+QUAD = array('f', (-0.5, -0.5, 0.5, -0.5, -0.5, 0.5, 0.5, 0.5))
+
+
+class _Slot:
+    """Texture, instance buffer and vertex array of one image."""
+    __slots__ = ('size', 'texture', 'buffer', 'vao')
+
+    def __init__(self, renderer, image):
+        ctx = renderer.ctx
+        self.size = image.get_size()
+
+        # The bullet images use a colorkey, blitting onto a transparent
+        # surface turns that into alpha.
+        rgba = pygame.Surface(self.size, flags=pygame.SRCALPHA)
+        rgba.blit(image, (0, 0))
+        self.texture = ctx.texture(self.size, 4, pygame.image.tobytes(rgba, 'RGBA'))
+
+        self.buffer = ctx.buffer(reserve=RESERVE * INSTANCE, dynamic=True)
+        self.vao = ctx.vertex_array(renderer.program, [
+            (renderer.quad, '2f', 'corner'),
+            (self.buffer, '2f 1f 1f/i', 'position', 'alpha', 'angle'),
+        ])
+
+
+class GLRenderer:
+    """Render the sprites of a `demo.FBlitGroup`.
+
+    Set it as `FBlitGroup.renderer`, the group then calls `draw` instead of
+    blitting.
+
+    Parameters
+    ----------
+    ctx : moderngl.Context
+        A context supporting OpenGL 3.3.
+
+    size : tuple[int, int]
+        The size of the screen.
+
+    """
+    def __init__(self, ctx, size):
+        self.ctx = ctx
+        self.size = size
+
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.program['screen'].value = size
+        self.quad = ctx.buffer(QUAD)
+        self.fbo = ctx.simple_framebuffer(size, components=4)
+
+        # The surface shares the memory the framebuffer is read into.
+        self.pixels = bytearray(size[0] * size[1] * 4)
+        self.surface = pygame.image.frombuffer(self.pixels, size, 'RGBA')
+
+        self._slots = {}  # image -> _Slot
+
+    def slot(self, image):
+        try:
+            return self._slots[image]
+        except KeyError:
+            slot = self._slots[image] = _Slot(self, image)
+            return slot
+
+    def draw(self, screen, batches, dynamic):
+        """Draw the static `batches` and the `dynamic` sprites of the group."""
+        instances = defaultdict(partial(array, 'f'))
+        leftovers = []
+
+        for batch in batches:
+            if batch.blits:
+                instances[batch.image].extend(chain.from_iterable((*rect.center, 1, 0) for _, rect in batch.blits))
+
+        for sprite in dynamic:
+            rsai = getattr(sprite, 'image_factory', None)
+            if (base := getattr(rsai, '_base_image', None)) is not None:
+                instances[base].extend((*sprite.rect.center, rsai.alpha / 255, radians(rsai.rotate)))
+            else:
+                leftovers.append((sprite.image, sprite.rect))
+
+        ctx = self.ctx
+        self.fbo.use()
+        self.fbo.clear(0, 0, 0, 0)
+        ctx.enable(moderngl.BLEND)
+        ctx.blend_func = moderngl.ONE, moderngl.ONE_MINUS_SRC_ALPHA
+
+        for image, data in instances.items():
+            nbytes = len(data) * data.itemsize
+            slot = self.slot(image)
+            if nbytes > slot.buffer.size:
+                slot.buffer.orphan(nbytes * 2)
+            slot.buffer.write(data)
+
+            slot.texture.use(0)
+            self.program['size'].value = slot.size
+            slot.vao.render(moderngl.TRIANGLE_STRIP, instances=nbytes // INSTANCE)
+
+        self.fbo.read_into(self.pixels, components=4)
+        screen.blit(self.surface, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+        if leftovers:
+            screen.blits(leftovers, doreturn=False)
+
+
+def create_renderer(size):
+    """Create a `GLRenderer` for a screen of `size`.
+
+    Returns `None` if `moderngl` is not installed or no OpenGL 3.3 context can
+    be created, e.g. without a display.  Without an X display, EGL is tried.
+    """
+    if moderngl is None:
+        print('moderngl is not installed, using blits')
+        return None
+
+    errors = []
+    for backend in ({}, {'backend': 'egl'}):
+        try:
+            ctx = moderngl.create_standalone_context(require=330, **backend)
+        except Exception as e:
+            errors.append(e)
+            continue
+        return GLRenderer(ctx, size)
+
+    print(f'No OpenGL context ({errors[-1]!r}), using blits')
+    return None
@@ -0,0 +1,94 @@
+import importlib
+import os
+
+from pgcooldown import Cooldown
+
+__all__ = ['DictWatcher']
+
+
+class DictWatcher:
+    """Reload a module when its file changes, and report changed dict entries.
+
+    The module is expected to hold a dict of plain data in `attr`.  After a
+    reload, the new dict is compared entry by entry against the old one, so
+    only the entries that actually changed need to be rebuilt.
+
+    There are no file system notifications, the file's mtime is polled, at
+    most once every `interval` seconds.
+
+    Parameters
+    ----------
+    module : module
+        The module to watch.
+
+    attr : str
+        Name of the dict in `module`.
+
+    validate : Callable[[Any], Any] = None
+        Called with every added or changed value after a reload.  If it
+        raises, the error is printed and the previous value is kept, or the
+        entry is dropped if it is new.
+
+    interval : float = 0.5
+        Poll interval in seconds.
+
+    Entries that disappear from the reloaded dict keep their last good value,
+    so code still referring to them doesn't break.
+
+    """
+    def __init__(self, module, attr, validate=None, interval=0.5):
+        self.module = module
+        self.attr = attr
+        self.validate = validate
+        self.cooldown = Cooldown(interval)
+        self.mtime = os.stat(module.__file__).st_mtime
+
+    def poll(self):
+        """Reload if changed.
+
+        Returns
+        -------
+        list
+            The keys that were added or changed and passed `validate`.  If
+            the reload fails, the error is printed, the old dict is kept, and
+            the result is empty.
+
+        """
+        if self.cooldown.hot():
+            return []
+        self.cooldown.reset()
+
+        mtime = os.stat(self.module.__file__).st_mtime
+        if mtime == self.mtime:
+            return []
+        self.mtime = mtime
+
+        old = getattr(self.module, self.attr)
+        try:
+            importlib.reload(self.module)
+        except Exception as e:
+            print(f'Reloading {self.module.__name__} failed: {e!r}')
+            setattr(self.module, self.attr, old)
+            return []
+
+        new = getattr(self.module, self.attr)
+        changed = []
+        for key, value in list(new.items()):
+            if key in old and old[key] == value:
+                continue
+            if self.validate is not None:
+                try:
+                    self.validate(value)
+                except Exception as e:
+                    print(f'Rejected {self.attr}[{key!r}]: {e!r}')
+                    if key in old:
+                        new[key] = old[key]
+                    else:
+                        del new[key]
+                    continue
+            changed.append(key)
+
+        for key in old.keys() - new.keys():
+            new[key] = old[key]
+
+        return changed
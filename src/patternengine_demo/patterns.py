@@ -0,0 +1,279 @@
+"""Pattern definitions for the demo timeline.
+
+This file is plain data, so it can be hot reloaded (`patternengine-demo
+--watch`) and compared pattern by pattern.  After saving, only the patterns
+that changed are rebuilt and swapped into running emitters.
+
+A pattern is a dict with these keys:
+
+    position: (anchor, dx, dy)
+        `anchor` is an attribute of the screen rect, e.g. 'center' or
+        'topright', the emitter is placed at that point plus the offset.
+
+    bullets: int
+    ring: (radius, steps[, aim[, width]])
+    heartbeat: (duration, pattern)
+    aim: float = 0
+        Arguments for `patternengine.BulletSource`, `Ring` and `Heartbeat`.
+
+    bullet: dict
+        `image` selects the entry from `BULLET_FACTORIES`, everything else is
+        passed to `bullet_factory`, e.g. `speed`, `fade`, `lifetime`,
+        `angular_momentum`.
+
+    lifetime: float
+        Lifetime of the emitter.
+
+    rotation: (vt0, vt1, duration, repeat) = None
+        A `LerpThing` turning the bullet source.
+
+    momentum: (x, y) = None
+        Movement of the emitter.
+
+    aimed: bool | 'nearest' = False
+        Aim the ring at the target, or with 'nearest', at the closest entity
+        with a `targetable` component.
+
+    lead: bool = False
+        Aim where the target will be when the bullets arrive, instead of
+        where it is.
+
+"""
+
+PATTERNS = {
+    'simple-ring': dict(
+        position=('center', 0, 0),
+        bullets=4, ring=(50, 4), heartbeat=(1, '#.......#.......'),
+        bullet=dict(image='hotpink', speed=100, fade=1),
+        lifetime=7.95),
+
+    'ring-stack': dict(
+        position=('center', 0, 0),
+        bullets=18, ring=(50, 18), heartbeat=(1, '#.#.#...........'),
+        bullet=dict(image='cyan', speed=100, fade=1),
+        lifetime=7.95),
+
+    'ring-and-stack-ring': dict(
+        position=('center', 0, 0),
+        bullets=18, ring=(50, 18), heartbeat=(1, '#.......#.......'),
+        bullet=dict(image='hotpink', speed=100, fade=1),
+        lifetime=7.95),
+
+    'ring-and-stack-stack': dict(
+        position=('center', 0, 0),
+        bullets=18, ring=(50, 18), heartbeat=(1, '#.#.#...........'), aim=10,
+        bullet=dict(image='cyan', speed=100, fade=1),
+        lifetime=7.95),
+
+    'five-steps-single': dict(
+        position=('center', 0, 0),
+        bullets=5, ring=(50, 5), heartbeat=(1, '#...............'),
+        bullet=dict(image='yellow', speed=100, fade=1),
+        lifetime=3.95),
+
+    'five-steps-double': dict(
+        position=('center', 0, 0),
+        bullets=5, ring=(50, 5), heartbeat=(1, '#.......#.......'),
+        bullet=dict(image='yellow', speed=100, fade=1),
+        lifetime=3.95),
+
+    'five-steps-rotating': dict(
+        position=('center', 0, 0),
+        bullets=5, ring=(50, 5), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='yellow', speed=100, fade=3),
+        rotation=(0, 360, 8, 1),
+        lifetime=3.95),
+
+    'one-step-rotating': dict(
+        position=('center', 0, 0),
+        bullets=1, ring=(50, 1), heartbeat=(1, '################'),
+        bullet=dict(image='green', speed=100, fade=1),
+        rotation=(0, 360, 8, 1),
+        lifetime=1.95),
+
+    'two-steps-rotating': dict(
+        position=('center', 0, 0),
+        bullets=2, ring=(10, 2), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='green', speed=100, fade=1),
+        rotation=(0, 360, 8, 1),
+        lifetime=1.95),
+
+    'four-steps-rotating': dict(
+        position=('center', 0, 0),
+        bullets=4, ring=(10, 4), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='green', speed=100, fade=1),
+        rotation=(0, 360, 8, 1),
+        lifetime=1.95),
+
+    'eight-steps-rotating': dict(
+        position=('center', 0, 0),
+        bullets=8, ring=(10, 8), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='green', speed=100, fade=1),
+        rotation=(0, 360, 8, 1),
+        lifetime=1.95),
+
+    'thirtysix-steps-rotating': dict(
+        position=('center', 0, 0),
+        bullets=36, ring=(10, 36), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='green', speed=100, fade=1),
+        rotation=(0, 360, 8, 1),
+        lifetime=3.95),
+
+    'half-ring-top': dict(
+        position=('midtop', 0, 50),
+        bullets=18, ring=(50, 18, 90, 180), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='hotpink', speed=100, fade=1),
+        lifetime=7.95),
+
+    'half-ring-bottom': dict(
+        position=('midbottom', 0, -50),
+        bullets=18, ring=(50, 18, -90, 180), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='cyan', speed=100, fade=1),
+        lifetime=7.95),
+
+    'quarter-ring-topleft': dict(
+        position=('topleft', 50, 50),
+        bullets=5, ring=(0, 5, 45, 90), heartbeat=(2, '#.#.#.#.#.#.#.#.'),
+        bullet=dict(image='green', speed=100, fade=1),
+        lifetime=7.95),
+
+    'quarter-ring-bottomright': dict(
+        position=('bottomright', -50, -50),
+        bullets=5, ring=(0, 5, -135, 90), heartbeat=(2, '#.#.#.#.#.#.#.#.'),
+        bullet=dict(image='green', speed=100, fade=1),
+        lifetime=7.95),
+
+    'any-angle-top': dict(
+        position=('midtop', 256, 50),
+        bullets=4, ring=(50, 4, 90, 30), heartbeat=(2, '#...#...#...#...'),
+        bullet=dict(image='yellow', speed=100, fade=1),
+        lifetime=3.95),
+
+    'any-angle-bottom': dict(
+        position=('midbottom', -256, -50),
+        bullets=4, ring=(50, 4, -90, 30), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='yellow', speed=100, fade=1),
+        lifetime=3.95),
+
+    'oscillating': dict(
+        position=('midtop', 0, 50),
+        bullets=5, ring=(50, 5, 0, 30), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='hotpink', speed=200, fade=1),
+        rotation=(165, 15, 2, 2),
+        lifetime=7.95),
+
+    'aiming': dict(
+        position=('midtop', 0, 50),
+        bullets=5, ring=(50, 5, -30, 30), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='green', speed=200, fade=1),
+        aimed=True,
+        lifetime=7.95),
+
+    'turning-bullets': dict(
+        position=('center', 0, 0),
+        bullets=16, ring=(250, 8), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='cyan', speed=150, lifetime=4, angular_momentum=90, fade=1),
+        lifetime=3.95),
+
+    'turning-bullets-slow': dict(
+        position=('center', 0, 0),
+        bullets=16, ring=(250, 16), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='cyan', speed=-150, lifetime=8, angular_momentum=15, fade=1),
+        lifetime=7.95),
+
+    'turning-bullets-fast': dict(
+        position=('center', 0, 0),
+        bullets=16, ring=(100, 16), heartbeat=(1, '#...#...#...#...'),
+        bullet=dict(image='green', speed=-150, lifetime=8, angular_momentum=45, fade=3),
+        lifetime=8),
+
+    'moving-ring': dict(
+        position=('topleft', 50, 50),
+        momentum=(80, 60),
+        bullets=5, ring=(50, 5), heartbeat=(1, '#.#.#.#.#.#.#.#.'),
+        bullet=dict(image='yellow', speed=10, lifetime=8, fade=3),
+        rotation=(0, 360, 8, 1),
+        lifetime=16),
+
+    # Is python too slow?
+    'stress-1-left': dict(
+        position=('topleft', 100, 100),
+        bullets=8, ring=(25, 8), heartbeat=(2, '###.............'),
+        bullet=dict(image='cyan', speed=100),
+        lifetime=47.95),
+
+    'stress-1-right': dict(
+        position=('topright', -100, 100),
+        bullets=8, ring=(25, 8), heartbeat=(2, '###.............'),
+        bullet=dict(image='cyan', speed=100),
+        lifetime=47.95),
+
+    'stress-2-left': dict(
+        position=('topleft', 100, 100),
+        bullets=36, ring=(50, 36), heartbeat=(2, '........#.......'),
+        bullet=dict(image='hotpink', speed=100),
+        lifetime=39.95),
+
+    'stress-2-right': dict(
+        position=('topright', -100, 100),
+        bullets=36, ring=(50, 36), heartbeat=(2, '........#.......'),
+        bullet=dict(image='hotpink', speed=100),
+        lifetime=39.95),
+
+    'stress-3-left': dict(
+        position=('topleft', 100, 100),
+        bullets=36, ring=(50, 36), heartbeat=(2, '#...#...#...#...'),
+        bullet=dict(image='hotpink', speed=100),
+        lifetime=37.95),
+
+    'stress-3-right': dict(
+        position=('topright', -100, 100),
+        bullets=36, ring=(50, 36), heartbeat=(2, '#...#...#...#...'),
+        bullet=dict(image='hotpink', speed=100),
+        lifetime=37.95),
+
+    'stress-4-left': dict(
+        position=('topleft', 100, 100),
+        bullets=36, ring=(50, 36), heartbeat=(2, '#.#.#.#.#.#.#.#.'),
+        bullet=dict(image='hotpink', speed=100),
+        lifetime=33.95),
+
+    'stress-4-right': dict(
+        position=('topright', -100, 100),
+        bullets=36, ring=(50, 36), heartbeat=(2, '#.#.#.#.#.#.#.#.'),
+        bullet=dict(image='hotpink', speed=100),
+        lifetime=33.95),
+
+    'stress-5-left': dict(
+        position=('bottomleft', 100, -100),
+        bullets=10, ring=(30, 10), heartbeat=(2, '#...#...#...#...'),
+        bullet=dict(image='green', speed=100, angular_momentum=45, lifetime=10),
+        lifetime=29.95),
+
+    'stress-5-right': dict(
+        position=('bottomright', -100, -100),
+        bullets=10, ring=(30, 10), heartbeat=(2, '#...#...#...#...'),
+        bullet=dict(image='green', speed=100, angular_momentum=45, lifetime=10),
+        lifetime=29.95),
+
+    'stress-6': dict(
+        position=('center', 0, 0),
+        bullets=16, ring=(100, 16), heartbeat=(2, '#.#.#.#.#.#.#.#.'),
+        bullet=dict(image='yellow', speed=100, fade=1),
+        rotation=(0, 360, 5, 1),
+        lifetime=21.95),
+
+    'stress-7': dict(
+        position=('center', 0, 0),
+        bullets=8, ring=(100, 8), heartbeat=(1, '#.#.#.#.#.#.#.#.'),
+        bullet=dict(image='lightblue', speed=-100, angular_momentum=10, fade=1),
+        rotation=(0, 360, 5, 1),
+        lifetime=13.95),
+
+    'stress-8': dict(
+        position=('center', 0, 0),
+        bullets=6, ring=(0, 6), heartbeat=(2, '################'),
+        bullet=dict(image='red', speed=150, angular_momentum=35, lifetime=16),
+        rotation=(0, 360, 4, 1),
+        lifetime=8),
+}
@@ -0,0 +1,53 @@
+import pygame
+
+from patternengine_demo.assets import normalize
+from patternengine_demo.background import Background
+from patternengine_demo.framework import GameState
+
+
+class Pause(GameState):
+    """A pause screen, to be run with `App.push`.
+
+    Shows the frozen `parent` state under a shade until P is pressed again.
+    While this is pushed, the `gameclock` stands still, so no timer of the
+    parent expires.
+
+    The parent is only drawn once.  After that, the screen still holds the
+    frame, and only what the metrics overlays drew over it is restored.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        font = pygame.font.Font(None, 96)
+        self.image = normalize(font.render('Paused', True, 'white'))
+        self.rect = self.image.get_rect(center=self.app.rect.center)
+
+        self.shade = pygame.Surface(self.app.rect.size, flags=pygame.SRCALPHA)
+        self.shade.fill((0, 0, 0, 128))
+
+        self.background = None
+        self.resume = False
+
+    def reset(self, *args, **kwargs):
+        super().reset(*args, **kwargs)
+        self.background = None
+        self.resume = False
+
+    def dispatch_event(self, e):
+        super().dispatch_event(e)
+        match e.type:
+            case pygame.KEYDOWN if e.key == pygame.K_p:
+                self.resume = True
+
+    def update(self, dt):
+        if self.resume:
+            return None, self.persist
+
+    def draw(self, screen):
+        if self.background is None:
+            self.parent.draw(screen)
+            screen.blit(self.shade, (0, 0))
+            screen.blit(self.image, self.rect)
+            self.background = Background(screen.get_size(), image=screen.copy())
+        else:
+            self.background.restore(screen, self.app.metrics.dirty)
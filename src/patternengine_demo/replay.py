@@ -0,0 +1,211 @@
+"""Record a session and play it back, with seeking.
+
+A recording is a binary stream:
+
+    header      b'PEDR', version (u16), game time (f64), the `random` state
+                (u32 size + marshal)
+
+followed by records, each starting with a tag byte:
+
+    b'F'        A frame: dt (f64), number of events (u16), and per event its
+                type (u32), key (u32) and mod (u16).  Only QUIT, KEYDOWN and
+                KEYUP are recorded.
+
+    b'S'        A snapshot from `App.snapshot`, taken before frame `frame`:
+                frame (u32), game time (f64), size (u32) + data.
+
+Since the simulation only depends on `dt`, input and the random state, playing
+back the frames reproduces the session.  To seek, the closest snapshot before
+the target is restored, and the remaining frames are simulated without
+drawing.
+"""
+import marshal
+import pygame
+import random
+import struct
+
+from patternengine_demo.framework import gameclock
+
+__all__ = ['Player', 'Recorder']
+
+MAGIC = b'PEDR'
+VERSION = 2
+
+HEADER = struct.Struct('<4sHd')
+SIZE = struct.Struct('<I')
+FRAME = struct.Struct('<dH')
+EVENT = struct.Struct('<IIH')
+SNAPSHOT = struct.Struct('<IdI')
+
+EVENTS = {pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP}
+
+
+class Recorder:
+    """Record frames and periodic snapshots to `path`.
+
+    Create this before the game states, so the random state in the header is
+    the one they start with, and set it as `App.replay`.
+
+    Parameters
+    ----------
+    path : str
+        The file to write.
+
+    interval : float = 5
+        Game time in seconds between snapshots.  Snapshots are skipped while
+        `App.snapshot` returns `None`.
+
+    """
+    def __init__(self, path, interval=5):
+        self.interval = interval
+        self.frames = 0
+        self.due = gameclock.now
+
+        rng = marshal.dumps(random.getstate())
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, gameclock.now) + SIZE.pack(len(rng)) + rng)
+
+    def frame(self, app, dt, events):
+        if app.gameclock.now >= self.due and (data := app.snapshot()) is not None:
+            self.file.write(b'S' + SNAPSHOT.pack(self.frames, app.gameclock.now, len(data)) + data)
+            self.due = app.gameclock.now + self.interval
+
+        events = [e for e in events if e.type in EVENTS]
+        self.file.write(b'F' + FRAME.pack(dt, len(events))
+                        + b''.join(EVENT.pack(e.type, getattr(e, 'key', 0), getattr(e, 'mod', 0))
+                                   for e in events))
+        self.frames += 1
+
+        return dt, events
+
+    def close(self):
+        self.file.close()
+
+
+class Player:
+    """Play back a recording from `path`.
+
+    Create this before the game states, it restores the random state they
+    were created with, and set it as `App.replay`.
+
+    Recorded frames replace the live `dt` and input.  From live input, only
+    QUIT and ESCAPE are passed on, LEFT and RIGHT seek 10 seconds back and
+    forth.  At the end of the recording, the app stops.
+
+    Parameters
+    ----------
+    path : str
+        The recording.
+
+    seek : int = None
+        Start playback at this time in milliseconds.
+
+    """
+    SEEK_STEP = 10
+
+    def __init__(self, path, seek=None):
+        with open(path, 'rb') as f:
+            self.data = f.read()
+
+        magic, version, self.t0 = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a recording')
+
+        offset = HEADER.size
+        size, = SIZE.unpack_from(self.data, offset)
+        offset += SIZE.size
+        random.setstate(marshal.loads(self.data[offset:offset + size]))
+        gameclock.now = self.t0
+        offset += size
+
+        # A recording of a killed session can end in a partial record, that
+        # one is dropped.
+        self.frames = []  # offsets of frame records
+        self.snapshots = []  # (game time, frame, offset, size)
+        while offset < len(self.data):
+            tag = self.data[offset:offset + 1]
+            try:
+                if tag == b'F':
+                    _, n = FRAME.unpack_from(self.data, offset + 1)
+                    end = offset + 1 + FRAME.size + n * EVENT.size
+                    record = offset + 1
+                elif tag == b'S':
+                    frame, t, size = SNAPSHOT.unpack_from(self.data, offset + 1)
+                    record = offset + 1 + SNAPSHOT.size
+                    end = record + size
+                else:
+                    raise ValueError(f'{path} is corrupt at offset {offset}')
+            except struct.error:
+                break
+            if end > len(self.data):
+                break
+
+            if tag == b'F':
+                self.frames.append(record)
+            else:
+                self.snapshots.append((t, frame, record, size))
+            offset = end
+
+        self.cursor = 0
+        self.pending_seek = seek
+
+    def _read(self, index):
+        offset = self.frames[index]
+        dt, n = FRAME.unpack_from(self.data, offset)
+        offset += FRAME.size
+
+        events = []
+        for _ in range(n):
+            type_, key, mod = EVENT.unpack_from(self.data, offset)
+            offset += EVENT.size
+            events.append(pygame.event.Event(type_, key=key, mod=mod) if type_ != pygame.QUIT
+                          else pygame.event.Event(type_))
+        return dt, events
+
+    def frame(self, app, dt, events):
+        live = []
+        for e in events:
+            if e.type == pygame.QUIT or e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
+                live.append(e)
+            elif e.type == pygame.KEYDOWN and e.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                step = self.SEEK_STEP if e.key == pygame.K_RIGHT else -self.SEEK_STEP
+                self.pending_seek = max(app.gameclock.now - self.t0 + step, 0) * 1000
+
+        if self.pending_seek is not None:
+            self.seek(app, self.pending_seek)
+            self.pending_seek = None
+
+        if self.cursor >= len(self.frames):
+            app.running = False
+            return 0, live
+
+        dt, recorded = self._read(self.cursor)
+        self.cursor += 1
+
+        return dt, recorded + live
+
+    def seek(self, app, ms):
+        """Jump to `ms` milliseconds after the start of the recording.
+
+        The closest snapshot before is restored, and the frames from there on
+        are simulated without drawing, up to the first frame at or after `ms`.
+        """
+        t = self.t0 + ms / 1000
+
+        candidates = [s for s in self.snapshots if s[0] <= t]
+        if candidates:
+            snap_t, frame, offset, size = candidates[-1]
+            # Simulating on from here is cheaper, if it's between the
+            # snapshot and the target.
+            if not snap_t <= app.gameclock.now <= t:
+                app.restore(self.data[offset:offset + size])
+                self.cursor = frame
+
+        while self.cursor < len(self.frames) and app.gameclock.now < t and app.running:
+            dt, events = self._read(self.cursor)
+            self.cursor += 1
+            app.dispatch_events(events)
+            app.update(dt)
+
+    def close(self):
+        pass
@@ -0,0 +1,564 @@
+"""Capture component state as bytes.
+
+Components are turned into plain data that `marshal` can handle, and back.
+Things that can't be serialized, like images or sprite groups, live for the
+whole run anyway, so they are registered once by name and only stored as a
+reference.
+
+The whole tinyecs world is stored by columns: entities with the same
+components form a table, and every component becomes a column.  Numeric data
+of known types, like the coordinates of all `Vector2` positions in a table,
+is packed into `array`s in one contiguous buffer, and read back through
+memoryviews.  Columns of images or functions hold indices into a side table,
+that stores each of these objects only once.
+
+Generators and `itertools.cycle` can't be inspected, so the bullet sources
+built by `make_bullet_source` use a `Cycle` instead.
+"""
+import glm
+import importlib
+import marshal
+import pygame
+import struct
+import tinyecs as ecs
+import tinyecs.compsys as ecsc
+
+import patternengine as pe
+
+from array import array
+from collections import defaultdict
+from functools import partial
+from itertools import chain, islice, repeat
+from operator import attrgetter, is_, itemgetter
+from types import FunctionType, BuiltinFunctionType, MethodType
+
+from pygame import Vector2
+from patternengine_demo.timers import Cooldown, LerpThing
+
+__all__ = ['Codec', 'Cycle', 'clear_world', 'codec', 'make_bullet_source']
+
+PLAIN = (type(None), bool, int, float, str, bytes)
+SIZE = struct.Struct('<I')
+ALIGN = 8
+
+
+class Cycle:
+    """An `itertools.cycle` over `items`, that can be captured.
+
+    The position `i` can be read and set.
+    """
+    __slots__ = ('items', 'i')
+
+    def __init__(self, items, i=0):
+        self.items = tuple(items)
+        self.i = i
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = self.items[self.i]
+        self.i = (self.i + 1) % len(self.items)
+        return item
+
+
+def make_bullet_source(bullets, ring, heartbeat, aim=0):
+    """Create a `patternengine.BulletSource` that can be captured.
+
+    Same as `BulletSource(bullets, Ring(*ring), Heartbeat(*heartbeat), aim)`,
+    but all cycles are a `Cycle`, and the heartbeat runs on a game clock
+    `Cooldown`.
+    """
+    ring = pe.Ring(*ring)
+    ring.arc = Cycle(islice(ring.arc, ring.steps))
+    ring.heartbeat = Cycle('#')
+
+    duration, pattern = heartbeat
+    heartbeat = object.__new__(pe.Heartbeat)
+    heartbeat.cooldown = Cooldown(duration / len(pattern), cold=True)
+    heartbeat.c = Cycle(pattern)
+
+    return pe.BulletSource(bullets, ring, heartbeat, aim)
+
+
+def _cooldown(duration, t0, remaining, paused):
+    cooldown = Cooldown(duration)
+    cooldown.t0, cooldown._remaining, cooldown.paused = t0, remaining, paused
+    return cooldown
+
+
+def _lerpthing(vt0, vt1, duration, ease, repeat, loops, base_loops):
+    lt = LerpThing(vt0, vt1, duration, ease, repeat)
+    lt.loops, lt._base_loops = loops, base_loops
+    return lt
+
+
+def _esprite(groups, image, rect):
+    sprite = ecsc.ESprite(*groups, image=image)
+    sprite.rect = rect
+    return sprite
+
+
+def _evsprite(groups, factory, rect):
+    sprite = ecsc.EVSprite(factory, *groups)
+    sprite.rect = rect
+    return sprite
+
+
+# Bulk access to the tinyecs registry.
+#
+# Creating entities component by component through `add_component` makes a
+# restore take seconds, so snapshots read and write the module globals `eidx`,
+# `cidx`, `oidx`, `plist` and `archetype` of tinyecs directly.  They are not
+# part of its public API, and nothing outside of `_entities`, `clear_world`
+# and `_add_entities` may touch them.  Writes must keep the registry exactly
+# as `create_entity` and `add_component` would leave it:
+#
+#   - `eidx[eid][cid]` and `cidx[cid][eid]` are the same object.
+#   - `oidx[id(comp)]` is the set of all eids having `comp` as a component.
+#     One object can be shared by many entities, e.g. the `True` of every
+#     `world` component.  tinyecs before 0.3.3 stores a single eid instead.
+#   - An entity is in `archetype[cids]` if and only if it has all `cids`, with
+#     its components listed in the order of `cids`.  The empty archetype holds
+#     every entity, with an empty list.
+
+_OIDX_SETS = getattr(ecs.oidx, 'default_factory', None) is set
+
+
+def _entities():
+    """The registry as `{eid: {cid: comp}}`, read only."""
+    return ecs.eidx
+
+
+def clear_world():
+    """Remove all entities.
+
+    Same as `tinyecs.remove_entity` for every entity, but the indices are
+    cleared at once, instead of entity by entity.
+    """
+    for comps in ecs.cidx.values():
+        # Most components are plain data, skip these in bulk.
+        if not any(hasattr(t, 'shutdown_') for t in set(map(type, comps.values()))):
+            continue
+        for comp in comps.values():
+            if shutdown := getattr(comp, 'shutdown_', None):
+                shutdown()
+
+    ecs.eidx.clear()
+    ecs.cidx.clear()
+    ecs.oidx.clear()
+    ecs.plist.clear()
+    for adict in ecs.archetype.values():
+        adict.clear()
+
+
+def _add_entities(eids, cids, columns):
+    """Bulk version of `create_entity` and `add_component` for a table."""
+    rows = list(zip(*columns))
+    ecs.eidx.update(zip(eids, map(dict, map(partial(zip, cids), rows))))
+
+    oidx = ecs.oidx
+    for cid, column in zip(cids, columns):
+        ecs.cidx.setdefault(cid, {}).update(zip(eids, column))
+        if _OIDX_SETS:
+            for comp, eid in zip(column, eids):
+                oidx[id(comp)].add(eid)
+        else:
+            oidx.update(zip(map(id, column), eids))
+
+    have = set(cids)
+    for at, adict in ecs.archetype.items():
+        if not at:
+            adict.update((eid, []) for eid in eids)
+        elif have.issuperset(at):
+            adict.update(zip(eids, map(list, zip(*(columns[cids.index(cid)] for cid in at)))))
+
+
+class _Dump:
+    """Column writer for `Codec.dump_world`."""
+    def __init__(self, codec):
+        self.codec = codec
+        self.memo = {}
+        self.side = {}  # id(obj) -> (index, obj)
+        self.parts = []
+        self.size = 0
+
+    def array(self, typecode, values):
+        data = array(typecode, values).tobytes()
+        offset = self.size
+        self.parts.append(data)
+        self.size += len(data)
+        if pad := -len(data) % ALIGN:
+            self.parts.append(bytes(pad))
+            self.size += pad
+        return (typecode, offset, len(data))
+
+    def refs(self, objs):
+        """Side table indices of `objs`."""
+        index = {obj: self.side.setdefault(id(obj), (len(self.side), obj))[0]
+                 for obj in dict.fromkeys(objs)}
+        return self.array('I', map(index.__getitem__, objs))
+
+    def groups(self, sprites):
+        """Names of the registered groups all `sprites` are in."""
+        names = []
+        for name, thing in self.codec._things.items():
+            if isinstance(thing, pygame.sprite.AbstractGroup):
+                n = sum(map(thing.spritedict.__contains__, sprites))
+                if n == len(sprites):
+                    names.append(name)
+                elif n:
+                    raise TypeError('Sprites in different groups')
+        return tuple(names)
+
+    def generic(self, values):
+        return ('*', tuple(self.codec.encode(v, self.memo) for v in values))
+
+    def split(self, values, key):
+        """Store `values` as separate columns, grouped by `key`."""
+        groups = defaultdict(list)
+        for i, k in enumerate(map(key, values)):
+            groups[k].append(i)
+        return ('x', len(values), tuple((self.array('I', index), self.column(list(map(values.__getitem__, index))))
+                                        for index in groups.values()))
+
+    def column(self, values, siblings=None):
+        """Store a list of `values` of one type, return its descriptor."""
+        types = set(map(type, values))
+        if types == {int, float}:
+            types = {float}
+        if len(types) != 1:
+            return self.split(values, type)
+        kind = types.pop()
+        if kind is partial and len(set(map(attrgetter('func'), values))) != 1:
+            return self.split(values, attrgetter('func'))
+
+        try:
+            if kind is float:
+                return ('f', self.array('d', values))
+            elif kind is int:
+                return ('i', self.array('q', values))
+            elif kind in PLAIN:
+                return ('l', values)
+            elif kind is Vector2:
+                return ('v', self.array('d', chain.from_iterable(values)))
+            elif kind is glm.vec2:
+                return ('g', self.array('d', chain.from_iterable(values)))
+            elif kind is pygame.Rect:
+                return ('R', self.array('i', chain.from_iterable(values)))
+            elif kind is Cooldown:
+                duration, t0, remaining, paused = map(attrgetter, ('duration', 't0', '_remaining', 'paused'))
+                return ('c', self.array('d', map(duration, values)), self.array('d', map(t0, values)),
+                        self.array('d', map(remaining, values)), self.array('b', map(paused, values)))
+            elif kind is LerpThing:
+                vt0, vt1, duration, ease, loops, base_loops = map(
+                    attrgetter, ('vt0', 'vt1', 'duration', 'ease', 'loops', '_base_loops'))
+                return ('L', self.column(list(map(vt0, values))), self.column(list(map(vt1, values))),
+                        self.column(list(map(duration, values))), self.refs(list(map(ease, values))),
+                        self.array('b', (int(v.repeat or 0) for v in values)),
+                        self.array('q', map(loops, values)), self.array('q', map(base_loops, values)))
+            elif kind is ecsc.RSAImage:
+                image, rotate, scale, alpha = map(attrgetter, ('_base_image', 'rotate', 'scale', 'alpha'))
+                return ('r', self.refs(list(map(image, values))), self.column(list(map(rotate, values))),
+                        self.column(list(map(scale, values))), self.column(list(map(alpha, values))))
+            elif kind is ecsc.ESprite:
+                return ('s', self.groups(values), self.refs(list(map(attrgetter('image'), values))),
+                        self.column(list(map(attrgetter('rect'), values))))
+            elif kind is ecsc.EVSprite:
+                factories = list(map(attrgetter('image_factory'), values))
+                cid = next(cid for cid, column in (siblings or {}).items()
+                           if all(map(is_, factories, column)))
+                return ('e', self.groups(values), cid, self.column(list(map(attrgetter('rect'), values))))
+            elif kind is partial:
+                args = list(map(attrgetter('args'), values))
+                if len(set(map(len, args))) == 1 and not any(map(attrgetter('keywords'), values)):
+                    return ('p', self.codec.encode(values[0].func, self.memo),
+                            tuple(self.column(list(map(itemgetter(i), args))) for i in range(len(args[0]))))
+        except (TypeError, ValueError, OverflowError, StopIteration):
+            pass
+
+        return self.generic(values)
+
+
+class _Load:
+    """Column reader for `Codec.load_world`."""
+    def __init__(self, codec, view, side):
+        self.codec = codec
+        self.memo = []
+        self.view = view
+        self.side = [codec.decode(obj, []) for obj in side]
+
+    def array(self, desc):
+        typecode, offset, size = desc
+        return self.view[offset:offset + size].cast(typecode)
+
+    def refs(self, desc):
+        return list(map(self.side.__getitem__, self.array(desc)))
+
+    def column(self, desc, siblings=None):
+        """Restore the list of values from a descriptor of `_Dump.column`."""
+        tag = desc[0]
+        if tag in ('f', 'i'):
+            return self.array(desc[1]).tolist()
+        elif tag == 'l':
+            return list(desc[1])
+        elif tag in ('v', 'g'):
+            a = self.array(desc[1])
+            return list(map(Vector2 if tag == 'v' else glm.vec2, a[::2], a[1::2]))
+        elif tag == 'R':
+            a = self.array(desc[1])
+            return list(map(pygame.Rect, a[::4], a[1::4], a[2::4], a[3::4]))
+        elif tag == 'c':
+            return list(map(_cooldown, *map(self.array, desc[1:4]), map(bool, self.array(desc[4]))))
+        elif tag == 'L':
+            _, vt0, vt1, duration, ease, repeat_, loops, base_loops = desc
+            return list(map(_lerpthing, self.column(vt0), self.column(vt1), self.column(duration),
+                            self.refs(ease), self.array(repeat_), self.array(loops), self.array(base_loops)))
+        elif tag == 'r':
+            _, image, rotate, scale, alpha = desc
+            return list(map(ecsc.RSAImage, self.refs(image), self.column(rotate), self.column(scale),
+                            self.column(alpha)))
+        elif tag == 's':
+            _, groups, image, rect = desc
+            groups = tuple(map(self.codec._things.__getitem__, groups))
+            return list(map(partial(_esprite, groups), self.refs(image), self.column(rect)))
+        elif tag == 'e':
+            _, groups, cid, rect = desc
+            groups = tuple(map(self.codec._things.__getitem__, groups))
+            return list(map(partial(_evsprite, groups), siblings[cid], self.column(rect)))
+        elif tag == 'p':
+            func = self.codec.decode(desc[1], self.memo)
+            return list(map(partial, repeat(func), *map(self.column, desc[2])))
+        elif tag == 'x':
+            res = [None] * desc[1]
+            for index, column in desc[2]:
+                for i, value in zip(self.array(index), self.column(column)):
+                    res[i] = value
+            return res
+        elif tag == '*':
+            return [self.codec.decode(v, self.memo) for v in desc[1]]
+
+        raise TypeError(f"Can't load column {tag!r}")
+
+
+class Codec:
+    """Encode objects as `marshal`-able data, and back.
+
+    Supported are plain values, tuples, lists, dicts, `Vector2`, `glm.vec2`,
+    `pygame.Rect`, the timers from `timers.py`, `Cycle`, bullet sources from
+    `make_bullet_source`, `ESprite`, `EVSprite`, `RSAImage`, functions,
+    partials and bound methods.  Functions are stored by module and name.
+
+    Everything else must be `register`ed.  Objects that appear multiple times
+    in one `dumps` are restored as a single object.
+
+    Raises
+    ------
+    TypeError
+        If an object can't be encoded.
+    """
+    def __init__(self):
+        self._names = {}  # id(thing) -> name
+        self._things = {}  # name -> thing
+
+    def register(self, name, thing):
+        """Store `thing` as a reference to `name`."""
+        if old := self._things.get(name):
+            del self._names[id(old)]
+        self._names[id(thing)] = name
+        self._things[name] = thing
+
+    def dumps(self, value):
+        return marshal.dumps(self.encode(value, {}))
+
+    def loads(self, data):
+        return self.decode(marshal.loads(data), [])
+
+    def dump_world(self, extra=None, columns=None):
+        """Capture all tinyecs entities.
+
+        Parameters
+        ----------
+        extra : object = None
+            Additional data to store, encoded like `dumps`.
+
+        columns : dict[str, list] = None
+            Additional lists, stored like component columns.  Use this for
+            large lists of objects of the same type, e.g. cron jobs.
+
+        Returns
+        -------
+        bytes
+
+        """
+        dump = _Dump(self)
+
+        eidx = _entities()
+        tables = defaultdict(list)
+        for eid, comps in eidx.items():
+            tables[tuple(comps)].append(eid)
+
+        world = []
+        for cids, eids in tables.items():
+            rows = list(map(eidx.__getitem__, eids))
+            siblings = {cid: list(map(itemgetter(cid), rows)) for cid in cids}
+            world.append((cids, eids, tuple(dump.column(column, siblings)
+                                            for column in siblings.values())))
+
+        columns = {name: dump.column(values) for name, values in (columns or {}).items()}
+        extra = self.encode(extra, dump.memo)
+        side = tuple(self.encode(obj, {}) for _, obj in dump.side.values())
+
+        head = marshal.dumps((world, columns, extra, side))
+        head += bytes(-(SIZE.size + len(head)) % ALIGN)
+        return b''.join((SIZE.pack(len(head)), head, *dump.parts))
+
+    def load_world(self, data):
+        """Restore the entities captured by `dump_world`.
+
+        All existing entities are removed first.
+
+        Returns
+        -------
+        tuple
+            `extra` and `columns` as passed to `dump_world`.
+
+        """
+        size, = SIZE.unpack_from(data)
+        world, columns, extra, side = marshal.loads(memoryview(data)[SIZE.size:SIZE.size + size])
+        load = _Load(self, memoryview(data)[SIZE.size + size:], side)
+
+        clear_world()
+        for cids, eids, descs in world:
+            siblings = {}
+            # EVSprites need their image factory column first
+            for cid, desc in sorted(zip(cids, descs), key=lambda item: item[1][0] == 'e'):
+                siblings[cid] = load.column(desc, siblings)
+            _add_entities(eids, cids, [siblings[cid] for cid in cids])
+
+        columns = {name: load.column(desc) for name, desc in columns.items()}
+        return self.decode(extra, load.memo), columns
+
+    def encode(self, value, memo):
+        """Encode `value`, see `dumps`."""
+        if id(value) in self._names:
+            return ('@', self._names[id(value)])
+
+        if type(value) in PLAIN:
+            return ('=', value)
+
+        if id(value) in memo:
+            return ('^', memo[id(value)][0])
+
+        enc = partial(self.encode, memo=memo)
+        match value:
+            case tuple():
+                res = ('t', tuple(enc(v) for v in value))
+            case list():
+                res = ('l', tuple(enc(v) for v in value))
+            case dict():
+                res = ('d', tuple((enc(k), enc(v)) for k, v in value.items()))
+            case Vector2():
+                res = ('v', value.x, value.y)
+            case glm.vec2():
+                res = ('g', value.x, value.y)
+            case pygame.Rect():
+                res = ('R', tuple(value))
+            case Cooldown():
+                res = ('c', value.duration, value.t0, value.paused, value._remaining)
+            case LerpThing():
+                res = ('L', value.vt0, value.vt1, enc(value.duration), enc(value.ease),
+                       int(value.repeat or 0), value.loops, value._base_loops)
+            case Cycle():
+                res = ('y', enc(value.items), value.i)
+            case pe.BulletSource():
+                ring, heartbeat = value.ring, value.heartbeat
+                res = ('b', value.bullets, value.aim,
+                       (ring.radius, ring.steps, ring.aim, ring.width, ring.randomize, ring.jitter,
+                        enc(ring.arc), enc(ring.heartbeat)),
+                       (enc(heartbeat.cooldown), enc(heartbeat.c)))
+            case ecsc.RSAImage():
+                res = ('r', enc(value._base_image), value.rotate, value.scale, value.alpha)
+            case ecsc.ESprite():
+                res = ('s', enc(value.image), enc(tuple(value.groups())), enc(value.rect))
+            case ecsc.EVSprite():
+                res = ('e', enc(value.image_factory), enc(tuple(value.groups())), enc(value.rect))
+            case partial():
+                res = ('p', enc(value.func), enc(value.args), enc(value.keywords))
+            case MethodType():
+                res = ('m', enc(value.__self__), value.__name__)
+            case FunctionType() | BuiltinFunctionType() if '<' not in value.__qualname__:
+                res = ('f', value.__module__, value.__qualname__)
+            case _:
+                raise TypeError(f"Can't encode {value!r}")
+
+        # Post order, so decode can number objects the same way.  The value is
+        # kept alive, so its id isn't reused by a temporary object.
+        memo[id(value)] = (len(memo), value)
+        return res
+
+    def decode(self, data, memo):
+        """Decode the result of `encode`, see `loads`."""
+        tag = data[0]
+        if tag == '=':
+            return data[1]
+        if tag == '@':
+            return self._things[data[1]]
+        if tag == '^':
+            return memo[data[1]]
+
+        dec = partial(self.decode, memo=memo)
+        match data:
+            case ('t', items):
+                res = tuple(dec(v) for v in items)
+            case ('l', items):
+                res = [dec(v) for v in items]
+            case ('d', items):
+                res = {dec(k): dec(v) for k, v in items}
+            case ('v', x, y):
+                res = Vector2(x, y)
+            case ('g', x, y):
+                res = glm.vec2(x, y)
+            case ('R', rect):
+                res = pygame.Rect(rect)
+            case ('c', duration, t0, paused, remaining):
+                res = _cooldown(duration, t0, remaining, paused)
+            case ('L', vt0, vt1, duration, ease, repeat, loops, base_loops):
+                res = _lerpthing(vt0, vt1, dec(duration), dec(ease), repeat, loops, base_loops)
+            case ('y', items, i):
+                res = Cycle(dec(items), i)
+            case ('b', bullets, aim, ring, heartbeat):
+                radius, steps, ring_aim, width, randomize, jitter, arc, beats = ring
+                ring = pe.Ring(radius, steps, ring_aim, width, randomize, jitter=jitter)
+                ring.arc, ring.heartbeat = dec(arc), dec(beats)
+
+                cooldown, c = heartbeat
+                heartbeat = object.__new__(pe.Heartbeat)
+                heartbeat.cooldown, heartbeat.c = dec(cooldown), dec(c)
+
+                res = pe.BulletSource(bullets, ring, heartbeat, aim)
+            case ('r', image, rotate, scale, alpha):
+                res = ecsc.RSAImage(dec(image), rotate, scale, alpha)
+            case ('s', image, groups, rect):
+                groups = dec(groups)
+                res = _esprite(groups, dec(image), dec(rect))
+            case ('e', factory, groups, rect):
+                factory = dec(factory)
+                res = _evsprite(dec(groups), factory, dec(rect))
+            case ('p', func, args, keywords):
+                res = partial(dec(func), *dec(args), **dec(keywords))
+            case ('m', obj, name):
+                res = getattr(dec(obj), name)
+            case ('f', module, qualname):
+                res = importlib.import_module(module)
+                for name in qualname.split('.'):
+                    res = getattr(res, name)
+            case _:
+                raise TypeError(f"Can't decode {data!r}")
+
+        memo.append(res)
+        return res
+
+
+codec = Codec()
+codec.register('ease:linear', LerpThing.ease)
@@ -0,0 +1,159 @@
+"""Cooldown, LerpThing and CronD running on the game clock.
+
+The `pgcooldown` timers read the wall clock, so they keep running no matter
+what the simulation does.  These drop-in replacements read
+`framework.gameclock` instead, which only advances with simulated frames.
+That makes their state reproducible, e.g. for replays.
+
+Only the parts of the `pgcooldown` API used by this package are provided.
+"""
+import heapq
+import weakref
+
+from dataclasses import dataclass, field
+from typing import Callable
+
+import pgcooldown
+
+from patternengine_demo.framework import gameclock
+
+__all__ = ['Cooldown', 'CronD', 'Cronjob', 'LerpThing']
+
+
+class Cooldown:
+    """A `pgcooldown.Cooldown` on the game clock.
+
+    See `pgcooldown.Cooldown` for the API.  The state is the plain attributes
+    below, so it can be captured and restored.
+
+    Attributes
+    ----------
+    duration : float
+        The time to cool down from.
+    t0 : float
+        Game time of the last reset.
+    paused : bool
+        Paused cooldowns don't cool down.
+    """
+    __slots__ = ('duration', 't0', 'paused', '_remaining')
+
+    def __init__(self, duration, cold=False, paused=False):
+        self.duration = float(duration.duration if isinstance(duration, Cooldown) else duration)
+        self.t0 = gameclock.now
+        self.paused = False
+        self._remaining = 0.0
+        if cold:
+            self.set_cold()
+        if paused:
+            self.pause()
+
+    def __repr__(self):
+        return f'Cooldown(duration={self.duration}, cold={self.cold()}, paused={self.paused})'
+
+    def __call__(self): return self.remaining  # noqa: E704
+    def __hash__(self): return id(self)  # noqa: E704
+    def __bool__(self): return self.hot()  # noqa: E704
+    def __int__(self): return int(self.temperature)  # noqa: E704
+    def __float__(self): return float(self.temperature)  # noqa: E704
+    def __lt__(self, other): return self.temperature < float(other)  # noqa: E704
+    def __le__(self, other): return self.temperature <= float(other)  # noqa: E704
+    def __eq__(self, other): return self.temperature == float(other)  # noqa: E704
+    def __ne__(self, other): return self.temperature != float(other)  # noqa: E704
+    def __gt__(self, other): return self.temperature > float(other)  # noqa: E704
+    def __ge__(self, other): return self.temperature >= float(other)  # noqa: E704
+
+    @property
+    def temperature(self):
+        """Time left, negative once cold."""
+        if self.paused:
+            return self._remaining
+        return self.duration - (gameclock.now - self.t0)
+
+    @property
+    def remaining(self):
+        """Time left, but never below 0."""
+        return max(self.temperature, 0)
+
+    @property
+    def normalized(self):
+        """Elapsed time as fraction between 0 and 1."""
+        return (1 - self.remaining / self.duration) if self.duration else 0
+
+    def cold(self):
+        return self.temperature <= 0
+
+    def hot(self):
+        return self.temperature > 0
+
+    def is_paused(self):
+        return self.paused
+
+    def reset(self, new=0, wrap=False):
+        """Restart the cooldown, optionally with a `new` duration.
+
+        With `wrap`, the time a cold cooldown has overflown is kept, so
+        periodic events don't drift.
+        """
+        if new:
+            self.duration = float(new)
+
+        overflow = (0 if self.hot() or not wrap or self.duration == 0
+                    else -self.temperature % self.duration)
+        self.t0 = gameclock.now - overflow
+        self.paused = False
+
+        return self
+
+    def set_cold(self):
+        self.t0 = gameclock.now - self.duration
+
+    def set_to(self, t=0):
+        """Set the remaining time to `t`."""
+        if self.paused:
+            self._remaining = t
+        else:
+            self.t0 = gameclock.now - self.duration + t
+
+    def pause(self):
+        self._remaining = self.remaining
+        self.paused = True
+        return self
+
+    def start(self):
+        if self.paused:
+            self.paused = False
+            self.set_to(self._remaining)
+            self._remaining = 0.0
+        return self
+
+
+class LerpThing(pgcooldown.LerpThing):
+    """A `pgcooldown.LerpThing` timed by a game clock `Cooldown`."""
+    def __post_init__(self, duration):
+        self.duration = duration if isinstance(duration, Cooldown) else Cooldown(duration)
+        self.loops -= 1
+        self._base_loops = self.loops
+
+        # See pgcooldown.LerpThing
+        if self.duration.duration == 0:
+            self.vt1 = self.vt0
+
+
+@dataclass(order=True)
+class Cronjob:
+    """A `pgcooldown.Cronjob` timed by a game clock `Cooldown`."""
+    cooldown: Cooldown | float
+    task: Callable = field(compare=False)
+    repeat: bool = field(compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.cooldown, Cooldown):
+            self.cooldown = Cooldown(self.cooldown)
+
+
+class CronD(pgcooldown.CronD):
+    """A `pgcooldown.CronD` running `Cronjob`s on the game clock."""
+    def add(self, cooldown, task, repeat=False):
+        cj = Cronjob(cooldown, task, repeat)
+        heapq.heappush(self.heap, cj)
+        return weakref.ref(cj)
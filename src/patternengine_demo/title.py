@@ -1,9 +1,11 @@
 import pygame
 import tinyecs.compsys as ecsc
 
-from pgcooldown import Cooldown
+from patternengine_demo.assets import normalize
 from patternengine_demo.framework import GameState
 from patternengine_demo.config import States
+from patternengine_demo.snapshot import codec
+from patternengine_demo.timers import Cooldown
 
 
 class Title(GameState):
@@ -14,12 +16,12 @@ class Title(GameState):
         self.group_off = pygame.sprite.Group()
 
         font = pygame.font.Font(None, 64)
-        image = font.render('Pattern Engine Demo', True, 'white')
+        image = normalize(font.render('Pattern Engine Demo', True, 'white'))
         sprite = ecsc.ESprite(self.group, self.group_off, image=image)
         sprite.rect.center = (self.app.rect.centerx, self.app.rect.height // 5 * 2)
 
         font = pygame.font.Font(None, 48)
-        image = font.render('press SPACE', True, 'white')
+        image = normalize(font.render('press SPACE', True, 'white'))
         sprite = ecsc.ESprite(self.group, image=image)
         sprite.rect.center = (self.app.rect.centerx, self.app.rect.height // 5 * 3)
 
@@ -33,6 +35,12 @@ class Title(GameState):
         self.blink = True
         self.go = False
 
+    def snapshot(self):
+        return codec.dumps((self.blink_cooldown, self.blink, self.go))
+
+    def restore(self, data):
+        self.blink_cooldown, self.blink, self.go = codec.loads(data)
+
     def dispatch_event(self, e):
         super().dispatch_event(e)
         match e.type:
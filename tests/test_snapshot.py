@@ -0,0 +1,70 @@
+"""A restored snapshot runs on exactly like the world it was taken from."""
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+import tinyecs as ecs  # noqa: E402
+
+from types import SimpleNamespace  # noqa: E402
+
+from patternengine_demo.config import FPS, SCREEN, TITLE, States  # noqa: E402
+from patternengine_demo.framework import App  # noqa: E402
+
+DT = 1 / FPS
+
+
+@pytest.fixture(scope='module')
+def app():
+    app = App(TITLE, SCREEN, FPS)
+
+    # The demo converts its images on import, this needs the App.
+    from patternengine_demo.demo import Demo
+
+    demo = Demo(app, SimpleNamespace(font=pygame.font.Font(None), watch=False, renderer='blit'))
+    app.start(States.DEMO, {States.DEMO: demo})
+
+    # Run into the timeline, so there are emitters and bullets in flight.
+    for _ in range(20 * FPS):
+        app.frame(DT)
+
+    yield app
+    pygame.quit()
+
+
+def world():
+    """Components and positions of all entities, independent of their eids."""
+    from patternengine_demo.demo import archetype_rows
+
+    return sorted((tuple(sorted(ecs.cids_of_eid(eid))),
+                   tuple(round(c, 3) for c in ecs.comp_of_eid(eid, 'position'))
+                   if ecs.eid_has(eid, 'position') else None)
+                  for eid, _ in archetype_rows())
+
+
+def run(app, frames):
+    for _ in range(frames):
+        app.frame(DT)
+    return world()
+
+
+def test_restore_runs_on_like_the_original(app):
+    snapshot = app.snapshot()
+    expected = run(app, 5 * FPS)
+
+    app.restore(snapshot)
+    assert run(app, 5 * FPS) == expected
+    assert len(expected) > 100
+
+
+def test_restored_entities_can_be_removed(app):
+    from patternengine_demo.demo import archetype_rows
+
+    app.restore(app.snapshot())
+    assert ecs.healthcheck()
+
+    for eid, _ in archetype_rows('world'):
+        ecs.remove_entity(eid)
+    assert not archetype_rows('world')